@@ -7,11 +7,145 @@ the download mechanism from the UCI website.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers, Retry
 import os
 from pathlib import Path
+from datetime import datetime
 from urllib.parse import urlparse, parse_qs
 import time
-import asyncio
+import json
+import functools
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Set up logging (override the level with e.g. UCI_LOG=WARNING to silence
+# progress output; unrecognised names fall back to INFO rather than failing
+# the import, since generate_calendar.py imports this module)
+LOG_LEVEL = os.environ.get('UCI_LOG', 'INFO').upper()
+if not isinstance(logging.getLevelName(LOG_LEVEL), int):
+    LOG_LEVEL = 'INFO'
+logging.basicConfig(level=LOG_LEVEL, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# The actual UCI API endpoint (discovered via Chrome Dev Tools)
+UCI_API_URL = "https://api.uci.ch/v1.2/ucibws/competitions/getreportxls"
+
+# Request headers mirroring the UCI website; identical for every year.
+# Only advertise the content encodings urllib3 can actually decode here
+# (br/zstd need the optional brotli/zstandard packages), so the server never
+# sends a body we would save undecoded.
+UCI_API_HEADERS = {
+    "accept": "application/json, text/plain, */*",
+    "accept-encoding": make_headers(accept_encoding=True)["accept-encoding"],
+    "accept-language": "en-GB,en;q=0.9",
+    "content-type": "application/json;charset=UTF-8",
+    "dnt": "1",
+    "origin": "https://www.uci.org",
+    "priority": "u=1, i",
+    "referer": "https://www.uci.org/",
+    "sec-ch-ua": '"Google Chrome";v="137", "Chromium";v="137", "Not/A)Brand";v="24"',
+    "sec-ch-ua-mobile": "?0",
+    "sec-ch-ua-platform": '"Linux"',
+    "sec-fetch-dest": "empty",
+    "sec-fetch-mode": "cors",
+    "sec-fetch-site": "cross-site",
+    "user-agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36"
+}
+
+def _build_payload(year: str) -> dict:
+    """Build the UCI API request payload for a given year"""
+    return {
+        "IsGrouped": True,
+        "Language": "En",
+        "Query": {
+            "discipline": "MTB",
+            "year": year
+        },
+        "ReportTitle": f"MTB - {year}"
+    }
+
+@functools.lru_cache(maxsize=None)
+def _payload_body(year: str) -> bytes:
+    """Serialized request body for a year (built once per process)"""
+    return json.dumps(_build_payload(year)).encode('utf-8')
+
+# Files downloaded more recently than this are not fetched again (unless forced)
+FRESH_FILE_TTL_SECONDS = 6 * 3600
+
+# Per-phase request timeouts in seconds: (connect, read)
+REQUEST_TIMEOUT = (5, 30)
+
+# Transient API failures retried by urllib3 with exponential backoff
+# (Retry-After is honoured; POST has to be allowed explicitly)
+RETRY_POLICY = Retry(
+    total=3,
+    backoff_factor=0.5,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=frozenset({'POST'}),
+    raise_on_status=False
+)
+
+# Chunk size used when streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Sidecar file (in the output directory) holding ETag / Last-Modified / sha256 per year
+VALIDATORS_FILENAME = '.etags.json'
+_validators_lock = threading.Lock()
+
+def _new_session() -> requests.Session:
+    """Create a session preloaded with the UCI API headers and retry policy"""
+    session = requests.Session()
+    session.headers.update(UCI_API_HEADERS)
+    session.mount('https://', HTTPAdapter(max_retries=RETRY_POLICY))
+    return session
+
+def _load_validators(output_dir: Path) -> dict:
+    """Load the year -> cache validator mapping from the sidecar file"""
+    try:
+        with open(output_dir / VALIDATORS_FILENAME, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def _save_validators(output_dir: Path, year: str, validators: dict) -> None:
+    """Record the cache validators for a year in the sidecar file"""
+    # Concurrent season downloads share the sidecar, so update it under a lock
+    with _validators_lock:
+        all_validators = _load_validators(output_dir)
+        all_validators[year] = validators
+        with open(output_dir / VALIDATORS_FILENAME, 'w', encoding='utf-8') as f:
+            json.dump(all_validators, f, indent=2, sort_keys=True)
+
+def _conditional_headers(validators: dict) -> dict:
+    """Build If-None-Match / If-Modified-Since headers from stored validators"""
+    headers = {}
+    if validators.get('etag'):
+        headers['if-none-match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['if-modified-since'] = validators['last_modified']
+    return headers
+
+def _post_xls(year: str, session: requests.Session, headers: dict = None) -> requests.Response:
+    """
+    POST the report request for a year
+    
+    Connection errors, read errors and 429/5xx responses are retried by the
+    session's adapter (see RETRY_POLICY); after the last retry the final
+    response is returned, or the last connection error is raised.
+    
+    Args:
+        year: Year to request
+        session: Session used for the request (keeps the connection alive)
+        headers: Extra per-request headers (e.g. conditional request headers)
+        
+    Returns:
+        The final response
+    """
+    
+    return session.post(UCI_API_URL, data=_payload_body(year), headers=headers, timeout=REQUEST_TIMEOUT, stream=True)
 
 def _try_browser_download(year: str, output_dir: Path) -> bool:
     """
@@ -26,30 +160,39 @@ def _try_browser_download(year: str, output_dir: Path) -> bool:
     """
     
     try:
-        # Import from the uci_calendar package
+        # Deferred imports: only needed when browser automation is requested
+        import asyncio
         import sys
         sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
         from uci_calendar import download_uci_year
         
-        # Run browser download
-        return asyncio.run(download_uci_year(year, output_dir, headless=True))
+        # Run browser download (on uvloop when available)
+        try:
+            import uvloop
+            run = uvloop.run
+        except ImportError:
+            run = asyncio.run
+        return run(download_uci_year(year, output_dir, headless=True))
         
     except ImportError as e:
-        print(f"❌ Browser automation not available: {e}")
-        print("💡 Install with: pip install playwright && playwright install chromium")
+        logger.error(f"❌ Browser automation not available: {e}")
+        logger.info("💡 Install with: pip install playwright && playwright install chromium")
         return False
     except Exception as e:
-        print(f"❌ Browser automation failed: {e}")
+        logger.error(f"❌ Browser automation failed: {e}")
         return False
 
-def download_uci_excel_for_year(year: str, output_dir: Path = None, try_browser: bool = True) -> bool:
+def download_uci_excel_for_year(year: str, output_dir: Path = None, try_browser: bool = False,
+                                session: requests.Session = None) -> bool:
     """
     Download UCI MTB Excel file for a specific year
     
     Args:
         year: Year to download (e.g. "2025")
         output_dir: Directory to save the file (defaults to data/)
-        try_browser: Whether to try browser automation first (defaults to True)
+        try_browser: Whether to try browser automation before the direct API
+            (defaults to False - Chromium startup costs seconds per call)
+        session: Session to reuse across downloads (a new one is created if omitted)
         
     Returns:
         True if successful, False otherwise
@@ -63,129 +206,142 @@ def download_uci_excel_for_year(year: str, output_dir: Path = None, try_browser:
     # Try browser automation first (if available and requested)
     if try_browser:
         try:
-            print("🤖 Attempting browser automation download...")
+            logger.info("🤖 Attempting browser automation download...")
             success = _try_browser_download(year, output_dir)
             if success:
                 return True
             else:
-                print("⚠️  Browser automation failed, falling back to direct API...")
+                logger.warning("⚠️  Browser automation failed, falling back to direct API...")
         except Exception as e:
-            print(f"⚠️  Browser automation error: {e}")
-            print("🔄 Falling back to direct API approach...")
+            logger.warning(f"⚠️  Browser automation error: {e}")
+            logger.info("🔄 Falling back to direct API approach...")
     
-    print("🔍 Using discovered UCI API endpoint...")
+    logger.info("🔍 Using discovered UCI API endpoint...")
     
-    # The actual UCI API endpoint (discovered via Chrome Dev Tools)
-    api_url = "https://api.uci.ch/v1.2/ucibws/competitions/getreportxls"
+    filename = f"{year}.xls"
+    output_file = output_dir / filename
     
-    # Request payload
-    payload = {
-        "IsGrouped": True,
-        "Language": "En", 
-        "Query": {
-            "discipline": "MTB",
-            "year": year
-        },
-        "ReportTitle": f"MTB - {year}"
-    }
+    # Only send conditional headers when we still have the file they describe
+    validators = _load_validators(output_dir).get(year, {}) if output_file.exists() else {}
     
-    headers = {
-        "accept": "application/json, text/plain, */*",
-        "accept-encoding": "gzip, deflate, br, zstd",
-        "accept-language": "en-GB,en;q=0.9",
-        "content-type": "application/json;charset=UTF-8",
-        "dnt": "1",
-        "origin": "https://www.uci.org",
-        "priority": "u=1, i",
-        "referer": "https://www.uci.org/",
-        "sec-ch-ua": '"Google Chrome";v="137", "Chromium";v="137", "Not/A)Brand";v="24"',
-        "sec-ch-ua-mobile": "?0",
-        "sec-ch-ua-platform": '"Linux"',
-        "sec-fetch-dest": "empty",
-        "sec-fetch-mode": "cors",
-        "sec-fetch-site": "cross-site",
-        "user-agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36"
-    }
+    # Use a short-lived session when the caller did not supply one
+    own_session = _new_session() if session is None else None
     
     try:
-        print("📡 Calling UCI API (no authentication required)...")
-        response = requests.post(api_url, json=payload, headers=headers, timeout=15)
-        
-        print(f"   Response status: {response.status_code}")
-        print(f"   Response headers: {dict(response.headers)}")
-        print(f"   Response content preview: {response.text[:500]}")
-        
-        if response.status_code == 200:
-            # Check if we got Excel file
-            content_type = response.headers.get('content-type', '').lower()
+        logger.info("📡 Calling UCI API (no authentication required)...")
+        with _post_xls(year, session or own_session, _conditional_headers(validators)) as response:
+            logger.info(f"   Response status: {response.status_code}")
+            logger.debug(f"   Response headers: {dict(response.headers)}")
             
-            if ('excel' in content_type or 
-                'spreadsheet' in content_type or
-                'application/vnd.ms-excel' in content_type or
-                'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' in content_type):
-                
-                filename = f"{year}.xls"
-                output_file = output_dir / filename
-                
-                with open(output_file, 'wb') as f:
-                    f.write(response.content)
-                
-                print(f"✅ SUCCESS! Downloaded: {output_file}")
-                print(f"   File size: {len(response.content)} bytes")
+            if response.status_code == 304:
+                # Unchanged on the server - keep our copy, just mark it fresh
+                output_file.touch()
+                logger.info(f"✅ {filename} not modified since last download")
                 return True
+            
+            if response.status_code == 200:
+                # Check if we got Excel file
+                content_type = response.headers.get('content-type', '').lower()
+                
+                if ('excel' in content_type or 
+                    'spreadsheet' in content_type or
+                    'application/vnd.ms-excel' in content_type or
+                    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet' in content_type):
+                    
+                    # Stream the body straight to disk instead of buffering it,
+                    # hashing as we go to detect unchanged content
+                    partial_file = output_dir / f"{filename}.part"
+                    digest = hashlib.sha256()
+                    with open(partial_file, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                            digest.update(chunk)
+                            f.write(chunk)
+                    sha256 = digest.hexdigest()
+                    
+                    if output_file.exists() and validators.get('sha256') == sha256:
+                        # Server doesn't support conditional requests, but the content is identical
+                        partial_file.unlink()
+                        output_file.touch()
+                        logger.info(f"✅ {filename} unchanged (same content hash)")
+                    else:
+                        os.replace(partial_file, output_file)
+                        logger.info(f"✅ SUCCESS! Downloaded: {output_file}")
+                        logger.info(f"   File size: {output_file.stat().st_size} bytes")
+                    
+                    _save_validators(output_dir, year, {
+                        'etag': response.headers.get('etag'),
+                        'last_modified': response.headers.get('last-modified'),
+                        'sha256': sha256
+                    })
+                    return True
+                else:
+                    logger.warning(f"   ⚠️  Unexpected content type: {content_type}")
+                    logger.info(f"   Response preview: {response.text[:200]}...")
             else:
-                print(f"   ⚠️  Unexpected content type: {content_type}")
-                print(f"   Response preview: {response.text[:200]}...")
-        else:
-            print(f"   ❌ API error: {response.status_code}")
-            print(f"   Response: {response.text[:200]}...")
+                logger.error(f"   ❌ API error: {response.status_code}")
+                logger.info(f"   Response: {response.text[:200]}...")
             
     except Exception as e:
-        print(f"   ❌ Request failed: {e}")
-    
-    print("\n❌ API download failed")
-    print("\n💡 Manual download instructions:")
-    print("1. Visit: https://www.uci.org/calendar/mtb/1voMyukVGR4iZMhMlDfRv0?discipline=MTB")
-    print("2. Click 'Download season' → 'xls'")
-    print(f"3. Save as: {output_dir}/{year}.xls")
-    print("\n🔧 API Details:")
-    print(f"   Endpoint: {api_url}")
-    print(f"   Method: POST")
-    print(f"   Payload: {payload}")
+        logger.error(f"   ❌ Request failed: {e}")
+    finally:
+        if own_session is not None:
+            own_session.close()
+    
+    logger.error("\n❌ API download failed")
+    logger.info("\n💡 Manual download instructions:")
+    logger.info("1. Visit: https://www.uci.org/calendar/mtb/1voMyukVGR4iZMhMlDfRv0?discipline=MTB")
+    logger.info("2. Click 'Download season' → 'xls'")
+    logger.info(f"3. Save as: {output_dir}/{year}.xls")
+    logger.info("\n🔧 API Details:")
+    logger.info(f"   Endpoint: {UCI_API_URL}")
+    logger.info(f"   Method: POST")
+    logger.info(f"   Payload: {_build_payload(year)}")
     
     return False
 
-def discover_available_years() -> list:
+@functools.lru_cache(maxsize=1)
+def discover_available_years() -> tuple:
     """
     Discover available years from UCI calendar
     
+    The result is cached for the lifetime of the process.
+    
     Returns:
-        List of available years as strings
+        Tuple of available years as strings
     """
     
     # For now, we'll try common years around current time
     # In the future, this could be enhanced to scrape the UCI website
     # to dynamically discover available seasons
     
-    from datetime import datetime
     current_year = datetime.now().year
     
     # Try current year and next 2 years (UCI often has future seasons)
-    potential_years = [
+    potential_years = (
         str(current_year),
         str(current_year + 1), 
         str(current_year + 2)
-    ]
+    )
     
-    print(f"🔍 Checking for available seasons: {', '.join(potential_years)}")
+    logger.info(f"🔍 Checking for available seasons: {', '.join(potential_years)}")
     return potential_years
 
-def download_all_available_seasons(output_dir: Path = None) -> dict:
+def _is_fresh(output_file: Path) -> bool:
+    """Check if a file was downloaded within FRESH_FILE_TTL_SECONDS"""
+    try:
+        return time.time() - output_file.stat().st_mtime < FRESH_FILE_TTL_SECONDS
+    except FileNotFoundError:
+        return False
+
+def download_all_available_seasons(output_dir: Path = None, force: bool = False,
+                                   try_browser: bool = False) -> dict:
     """
     Download all available UCI MTB seasons
     
     Args:
         output_dir: Directory to save files (defaults to data/)
+        force: Re-download seasons even if a recent file already exists
+        try_browser: Whether to try browser automation before the direct API
         
     Returns:
         Dictionary with year -> success status
@@ -196,81 +352,110 @@ def download_all_available_seasons(output_dir: Path = None) -> dict:
     
     output_dir.mkdir(exist_ok=True)
     
-    print("🚀 Starting dynamic UCI MTB season download...")
+    logger.info("🚀 Starting dynamic UCI MTB season download...")
     
     # Discover available years
     years_to_try = discover_available_years()
     
     results = {}
     successful_downloads = 0
+    skipped = 0
     
+    pending = []
     for year in years_to_try:
-        print(f"\n📅 Attempting to download {year} season...")
+        if not force and _is_fresh(output_dir / f"{year}.xls"):
+            logger.info(f"\n⏭️  {year}.xls downloaded recently - skipping (use --force to re-download)")
+            results[year] = True
+            skipped += 1
+        else:
+            pending.append(year)
+    
+    # Downloads are network-bound, so fetch all pending seasons concurrently,
+    # sharing one session so connections to the API are reused
+    with _new_session() as session, ThreadPoolExecutor(max_workers=max(len(pending), 1)) as executor:
+        futures = {}
+        for year in pending:
+            logger.info(f"\n📅 Attempting to download {year} season...")
+            futures[year] = executor.submit(download_uci_excel_for_year, year, output_dir,
+                                            try_browser=try_browser, session=session)
         
-        try:
-            success = download_uci_excel_for_year(year, output_dir)
-            results[year] = success
-            
-            if success:
-                successful_downloads += 1
-                print(f"✅ Successfully downloaded {year}.xls")
-            else:
-                print(f"❌ Failed to download {year} season")
+        for year, future in futures.items():
+            try:
+                success = future.result()
+                results[year] = success
                 
-        except Exception as e:
-            print(f"❌ Error downloading {year}: {e}")
-            results[year] = False
+                if success:
+                    successful_downloads += 1
+                    logger.info(f"✅ Successfully downloaded {year}.xls")
+                else:
+                    logger.error(f"❌ Failed to download {year} season")
+                    
+            except Exception as e:
+                logger.error(f"❌ Error downloading {year}: {e}")
+                results[year] = False
     
-    print(f"\n📊 Download Summary:")
-    print(f"   Attempted: {len(years_to_try)} seasons")
-    print(f"   Successful: {successful_downloads} downloads")
-    print(f"   Failed: {len(years_to_try) - successful_downloads}")
+    logger.info(f"\n📊 Download Summary:")
+    logger.info(f"   Attempted: {len(years_to_try)} seasons")
+    logger.info(f"   Successful: {successful_downloads} downloads")
+    logger.info(f"   Skipped (recent): {skipped}")
+    logger.info(f"   Failed: {len(years_to_try) - successful_downloads - skipped}")
     
     if successful_downloads > 0:
-        print(f"\n💾 Downloaded files saved to: {output_dir}")
+        logger.info(f"\n💾 Downloaded files saved to: {output_dir}")
         # List downloaded files
-        excel_files = list(output_dir.glob("*.xls")) + list(output_dir.glob("*.xlsx"))
-        for file in sorted(excel_files):
-            size_kb = file.stat().st_size // 1024
-            print(f"   📄 {file.name} ({size_kb} KB)")
-    
-    if successful_downloads == 0:
-        print(f"\n⚠️  No seasons downloaded successfully")
-        print(f"💡 Manual download instructions:")
-        print(f"1. Visit: https://www.uci.org/calendar/mtb/1voMyukVGR4iZMhMlDfRv0?discipline=MTB")
-        print(f"2. Click 'Download season' → 'xls'")
-        print(f"3. Save files as: {output_dir}/YYYY.xls (e.g. 2025.xls)")
+        # Single directory scan; DirEntry caches its stat result
+        with os.scandir(output_dir) as entries:
+            excel_files = [e for e in entries
+                           if e.is_file() and e.name.lower().endswith(('.xls', '.xlsx'))]
+        for entry in sorted(excel_files, key=lambda e: e.name):
+            size_kb = entry.stat().st_size // 1024
+            logger.info(f"   📄 {entry.name} ({size_kb} KB)")
+    
+    if successful_downloads == 0 and skipped == 0:
+        logger.warning(f"\n⚠️  No seasons downloaded successfully")
+        logger.info(f"💡 Manual download instructions:")
+        logger.info(f"1. Visit: https://www.uci.org/calendar/mtb/1voMyukVGR4iZMhMlDfRv0?discipline=MTB")
+        logger.info(f"2. Click 'Download season' → 'xls'")
+        logger.info(f"3. Save files as: {output_dir}/YYYY.xls (e.g. 2025.xls)")
         
     return results
 
 if __name__ == "__main__":
     import sys
     
+    # Check for force flag (re-download even recently fetched seasons)
+    force = '--force' in sys.argv
+    
+    # Browser automation is opt-in (Playwright/Chromium startup is slow)
+    try_browser = '--browser' in sys.argv
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    
     # Check command line arguments
-    if len(sys.argv) > 1:
-        if sys.argv[1].lower() in ['all', 'auto', 'dynamic']:
+    if args:
+        if args[0].lower() in ['all', 'auto', 'dynamic']:
             # Download all available seasons
-            print("🔄 Dynamic mode: Downloading all available seasons...")
-            results = download_all_available_seasons()
+            logger.info("🔄 Dynamic mode: Downloading all available seasons...")
+            results = download_all_available_seasons(force=force, try_browser=try_browser)
             
             # Exit with error if no downloads succeeded
             if not any(results.values()):
                 exit(1)
         else:
             # Download specific year
-            year = sys.argv[1]
-            print(f"📅 Single year mode: Downloading {year} season...")
-            success = download_uci_excel_for_year(year)
+            year = args[0]
+            logger.info(f"📅 Single year mode: Downloading {year} season...")
+            success = download_uci_excel_for_year(year, try_browser=try_browser)
             if not success:
                 exit(1)
     else:
         # Default: try dynamic download
-        print("🔄 No arguments provided - trying dynamic download...")
-        print("💡 Use 'python download_uci_excel.py YYYY' for specific year")
-        print("💡 Use 'python download_uci_excel.py all' for all seasons")
-        print()
+        logger.info("🔄 No arguments provided - trying dynamic download...")
+        logger.info("💡 Use 'python download_uci_excel.py YYYY' for specific year")
+        logger.info("💡 Use 'python download_uci_excel.py all' for all seasons")
+        logger.info("💡 Add '--force' to re-download recently fetched seasons")
+        logger.info("💡 Add '--browser' to try browser automation before the direct API")
         
-        results = download_all_available_seasons()
+        results = download_all_available_seasons(force=force, try_browser=try_browser)
         
         # Exit with error if no downloads succeeded
         if not any(results.values()):
@@ -5,6 +5,10 @@ This is the entry point used by GitHub Actions
 """
 
 import sys
+import shutil
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from pathlib import Path
 
 # Add src to path for imports
@@ -12,33 +16,81 @@ sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
 
 from uci_calendar import CalendarGenerator, HTMLGenerator, UCIExcelParser
 
-def main():
-    """Generate both iCal and HTML calendar files using Excel data"""
+# Records a hash of the last rendered events so unchanged runs can be skipped
+BUILD_KEY_FILENAME = '.last_build_key'
+
+# Bump whenever a change to this script alters the generated files, so the
+# next run rebuilds them instead of skipping
+BUILD_KEY_VERSION = 1
+
+# Files that shape the generated output besides the events themselves - any
+# edit to them invalidates the build key
+PACKAGE_DIR = Path(__file__).parent.parent / 'src' / 'uci_calendar'
+BUILD_INPUT_FILES = (
+    PACKAGE_DIR / 'templates' / 'debug_calendar.html',
+    PACKAGE_DIR / 'html_generator.py',
+    PACKAGE_DIR / 'calendar_generator.py'
+)
+
+def find_excel_files(data_dir: Path) -> list:
+    """Find UCI Excel files in the data directory with a single directory scan"""
+    if not data_dir.is_dir():
+        return []
+    
+    # Skip git.keep and other hidden/non-data files
+    return [f for f in data_dir.iterdir()
+            if f.suffix.lower() in ('.xls', '.xlsx') and not f.name.startswith('.')]
+
+def compute_build_key(events: list) -> str:
+    """
+    Hash the events to be rendered, plus today's date and the generator inputs
+    
+    The date is included because the debug view shows relative dates
+    ("in N days"), so it must be regenerated at least daily. The template,
+    generator sources and BUILD_KEY_VERSION are included so that changing
+    how the files are rendered also forces a rebuild.
+    """
+    digest = hashlib.sha256(date.today().isoformat().encode())
+    digest.update(f"v{BUILD_KEY_VERSION}".encode())
+    for path in BUILD_INPUT_FILES:
+        digest.update(path.read_bytes() if path.exists() else b'')
+    digest.update(repr(events).encode())
+    return digest.hexdigest()
+
+def read_build_key(path: Path) -> str:
+    """Read the build key stored by the previous successful generation"""
+    try:
+        return path.read_text(encoding='utf-8').strip()
+    except FileNotFoundError:
+        return ''
+
+def main(force: bool = False):
+    """
+    Generate both iCal and HTML calendar files using Excel data
+    
+    Args:
+        force: Regenerate even if the events are unchanged since the last run
+    """
     print("🚀 Starting UCI MTB Calendar generation...")
     
     success_count = 0
     
     # Load events from ALL available Excel files in data directory
     data_dir = Path(__file__).parent.parent / 'data'
-    existing_files = list(data_dir.glob("*.xls")) + list(data_dir.glob("*.xlsx"))
-    
-    # Filter out git.keep and other non-data files
-    excel_files = [f for f in existing_files if f.name != 'git.keep' and not f.name.startswith('.')]
+    excel_files = find_excel_files(data_dir)
     
     if not excel_files:
         print("❌ ERROR: No UCI Excel files found!")
         print(f"📁 Searched directory: {data_dir}")
-        # Try to download files
+        # Try to download files (in-process, no extra interpreter)
         try:
-            import subprocess
+            sys.path.insert(0, str(Path(__file__).parent))
+            from download_uci_excel import download_all_available_seasons
             
-            download_script = Path(__file__).parent / 'download_uci_excel.py'
-            result = subprocess.run(['python', str(download_script), 'all'], 
-                                  capture_output=True, text=True, timeout=60)
+            download_all_available_seasons(data_dir)
             
             # Check if any files were downloaded
-            excel_files = [f for f in data_dir.glob("*.xls") if f.name != 'git.keep']
-            excel_files.extend([f for f in data_dir.glob("*.xlsx") if f.name != 'git.keep'])
+            excel_files = find_excel_files(data_dir)
             
             if excel_files:
                 print("✅ Successfully downloaded UCI Excel files!")
@@ -65,10 +117,9 @@ def main():
     
     print(f"\n📁 Found {len(excel_files)} UCI Excel file(s):")
     for i, file in enumerate(excel_files, 1):
-        file_size = file.stat().st_size
-        file_date = file.stat().st_mtime
-        from datetime import datetime
-        file_date_str = datetime.fromtimestamp(file_date).strftime("%Y-%m-%d %H:%M")
+        st = file.stat()
+        file_size = st.st_size
+        file_date_str = datetime.fromtimestamp(st.st_mtime).strftime("%Y-%m-%d %H:%M")
         print(f"   {i}. {file.name} ({file_size:,} bytes, modified: {file_date_str})")
     
     print(f"\n🔄 Combining events from all {len(excel_files)} files for comprehensive calendar")
@@ -86,41 +137,52 @@ def main():
     
     print(f"✅ Loaded {len(events)} events from Excel file")
     
-    # Filter for upcoming events
+    # Filter for upcoming events once; both generators share this list
     upcoming_events = parser.get_upcoming_events()
     print(f"📅 {len(upcoming_events)} upcoming events")
-    events = upcoming_events
     
-    # Generate iCal file
-    print("📅 Generating iCal file...")
+    # Output locations (debug view is generated in templates directory for local serving)
+    templates_dir = PACKAGE_DIR / 'templates'
+    debug_html_path = templates_dir / 'debug.html'
+    build_key_path = templates_dir / BUILD_KEY_FILENAME
+    
+    # Skip regeneration if the same events were already rendered today
+    build_key = compute_build_key(upcoming_events)
+    outputs_exist = Path('calendar.ics').exists() and debug_html_path.exists()
+    if not force and outputs_exist and read_build_key(build_key_path) == build_key:
+        print("✅ Events unchanged since last generation - skipping (use --force to regenerate)")
+        return 0
+    
     cal_generator = CalendarGenerator()
-    cal_generator.events = events  # Set Excel events
+    cal_generator.events = upcoming_events  # Set Excel events
+    
+    html_generator = HTMLGenerator()
+    html_generator.events = upcoming_events  # Set Excel events
+    
+    # The two outputs are independent, so render and write them concurrently
+    print("📅 Generating iCal file...")
+    print("🔧 Generating HTML debug view...")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        ical_future = executor.submit(cal_generator.generate_ical_file, 'calendar.ics')
+        html_future = executor.submit(html_generator.generate_html_calendar, str(debug_html_path))
+        ical_ok, html_ok = ical_future.result(), html_future.result()
     
-    if cal_generator.generate_ical_file('calendar.ics'):
+    if ical_ok:
         print("✅ iCal file generated successfully")
         success_count += 1
     else:
         print("❌ Failed to generate iCal file")
         return 5
     
-    # Generate HTML debug view
-    print("🔧 Generating HTML debug view...")
-    html_generator = HTMLGenerator()
-    html_generator.events = events  # Set Excel events
-    
-    # Generate in templates directory for local serving
-    templates_dir = Path(__file__).parent.parent / 'src' / 'uci_calendar' / 'templates'
-    debug_html_path = templates_dir / 'debug.html'
-    
-    if html_generator.generate_html_calendar(str(debug_html_path)):
+    if html_ok:
         print("✅ HTML debug view generated successfully")
         success_count += 1
         
         # Copy calendar.ics to templates directory for local serving
         try:
-            import shutil
+            # Plain content copy (uses sendfile on Linux); metadata isn't needed
             calendar_ics_path = templates_dir / 'calendar.ics'
-            shutil.copy2('calendar.ics', str(calendar_ics_path))
+            shutil.copyfile('calendar.ics', str(calendar_ics_path))
             print("📋 Calendar file copied to templates directory for local serving")
         except Exception as e:
             print(f"⚠️  Warning: Could not copy calendar.ics to templates: {e}")
@@ -129,6 +191,7 @@ def main():
         # Don't fail for HTML issues, iCal is the main output
     
     if success_count == 2:
+        build_key_path.write_text(build_key, encoding='utf-8')
         print("🎉 All files generated successfully!")
         return 0
     elif success_count == 1:
@@ -139,4 +202,4 @@ def main():
         return 2
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main(force='--force' in sys.argv))
\ No newline at end of file
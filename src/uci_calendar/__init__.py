@@ -6,28 +6,51 @@ A package for scraping UCI MTB calendar events and generating calendar files.
 
 # Scraper temporarily disabled - Excel parsing is primary data source
 # from .scraper import UCICalendarScraper
-from .calendar_generator import CalendarGenerator
-from .html_generator import HTMLGenerator
-from .excel_parser import UCIExcelParser
-from .browser_downloader import UCIBrowserDownloader, download_uci_year, download_uci_bulk
+import importlib
+
+# Public classes/functions -> submodule defining them. Submodules are imported
+# on first access (see __getattr__), so e.g. generating a calendar does not
+# load pandas and parsing does not load asyncio/playwright.
+_LAZY_EXPORTS = {
+    'CalendarGenerator': 'calendar_generator',
+    'HTMLGenerator': 'html_generator',
+    'UCIExcelParser': 'excel_parser',
+    'UCIEvent': 'excel_parser',
+    'UCIBrowserDownloader': 'browser_downloader',
+    'download_uci_year': 'browser_downloader',
+    'download_uci_bulk': 'browser_downloader'
+}
 
 __version__ = "1.0.0"
 __author__ = "UCI MTB Calendar Sync"
 
+def __getattr__(name):
+    """Import public names from their submodule on first use (PEP 562)"""
+    if name in _LAZY_EXPORTS:
+        module = importlib.import_module(f".{_LAZY_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 # Package-level convenience functions
 def parse_excel_events(excel_file_path):
     """Convenience function to parse events from Excel file"""
+    from .excel_parser import UCIExcelParser
+    
     parser = UCIExcelParser()
     return parser.parse_excel_file(excel_file_path)
 
 def generate_ical(events, filename='calendar.ics'):
     """Convenience function to generate iCal file from events"""
+    from .calendar_generator import CalendarGenerator
+    
     generator = CalendarGenerator()
     generator.events = events
     return generator.generate_ical_file(filename)
 
 def generate_html(filename='debug.html'):
     """Convenience function to generate HTML debug view"""
+    from .html_generator import HTMLGenerator
+    
     generator = HTMLGenerator()
     return generator.generate_html_calendar(filename)
 
@@ -43,6 +66,8 @@ async def download_uci_excel(year_or_years, output_dir=None, headless=True):
     Returns:
         True/dict depending on single year or multiple years
     """
+    from .browser_downloader import download_uci_year, download_uci_bulk
+    
     if isinstance(year_or_years, str):
         return await download_uci_year(year_or_years, output_dir, headless)
     else:
@@ -53,6 +78,7 @@ __all__ = [
     'CalendarGenerator', 
     'HTMLGenerator',
     'UCIExcelParser',
+    'UCIEvent',
     'UCIBrowserDownloader',
     'parse_excel_events',
     'generate_ical',
@@ -7,13 +7,131 @@ Bypasses protection mechanisms by using real browser interactions.
 """
 
 import asyncio
+import functools
+import inspect
 import logging
+import os
+import time
+import types
 from pathlib import Path
-from typing import Optional, List, Dict
+from urllib.parse import urljoin
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+CALENDAR_URL = "https://www.uci.org/calendar/mtb/1voMyukVGR4iZMhMlDfRv0?discipline=MTB"
+
+# Cookie consent patterns
+COOKIE_SELECTORS = [
+    '#cookiescript_accept',
+    '#cookiescript_accept_all',
+    'button:has-text("Accept")',
+    'button:has-text("Accept All")',
+    'button:has-text("OK")',
+    '[data-testid="accept-cookies"]',
+    '.cookie-accept',
+    '.accept-cookies'
+]
+
+# Overlay close buttons
+OVERLAY_CLOSE_SELECTORS = [
+    '[aria-label="Close"]',
+    'button:has-text("Close")',
+    '.modal-close',
+    '.popup-close',
+    '.overlay-close'
+]
+
+# Download button/link patterns
+DOWNLOAD_SELECTORS = [
+    'text="Download season"',
+    'text="Download"',
+    '[aria-label*="Download"]',
+    'a[href*="excel"]',
+    'a[href*=".xls"]',
+    'button:has-text("Download")',
+    '.download-button',
+    '#download-button'
+]
+
+# XLS/Excel format options shown after clicking download
+EXCEL_FORMAT_SELECTORS = [
+    'text="xls"',
+    'text="Excel"',
+    'a[href*=".xls"]',
+    '[data-format="xls"]'
+]
+
+# Plain links to the spreadsheet, fetched directly when the download menu renders one
+EXCEL_LINK_SELECTOR = 'a[href*=".xls"]'
+
+# Content-type fragments of a spreadsheet response (anything else, e.g. an
+# HTML interstitial, is not saved)
+EXCEL_CONTENT_TYPES = ('excel', 'spreadsheet')
+
+# How long to wait for the browser download to start (ms)
+DOWNLOAD_TIMEOUT = 30000
+
+# Extra passes over failed years in a bulk download (reusing the same browser)
+BULK_RETRY_ATTEMPTS = 2
+
+# Whether the page already shows a season: only exact values count (a
+# <select> set to the year, or a data-current-year attribute equal to it) -
+# element text is not enough, since a season dropdown lists every year
+DISPLAYED_YEAR_SCRIPT = """year =>
+    [...document.querySelectorAll('select')].some(e => e.value === year) ||
+    [...document.querySelectorAll('[data-current-year]')].some(e => e.dataset.currentYear === year)"""
+
+# How long to wait for an optional element before giving up on it (ms)
+OPTIONAL_CLICK_TIMEOUT = 2500
+
+# How long to wait to click an element we know is on the page (ms)
+CLICK_TIMEOUT = 10000
+
+# Cap on a single element query, e.g. while the page is mid-navigation (s)
+PROBE_TIMEOUT = 1.5
+
+# How long to wait for the page's network activity to settle (ms)
+NETWORK_IDLE_TIMEOUT = 15000
+
+# Cookies/localStorage saved after a successful download (in the output
+# directory) so later runs start with consent already given
+STORAGE_STATE_FILENAME = '.uci_browser_state.json'
+
+# Files downloaded more recently than this are not fetched again (unless forced)
+FRESH_FILE_TTL_SECONDS = 6 * 3600
+
+# Set UCI_PW_FAST=1 to skip Playwright's per-call stack inspection (see below)
+FAST_PLAYWRIGHT_ENV = 'UCI_PW_FAST'
+
+# Set UCI_DEBUG=1 to save debug screenshots to the output directory
+DEBUG_ENV = 'UCI_DEBUG'
+
+def _disable_playwright_stack_inspection() -> None:
+    """
+    Stop Playwright from calling inspect.stack() on every API call
+    
+    Playwright walks the full Python stack for each call (click, locator
+    count, ...) to label it in traces and error messages, which is a large
+    share of the CPU time spent driving the page. This swaps the inspect
+    module seen by Playwright's connection layer for a copy whose stack()
+    returns nothing; the global inspect module is left untouched.
+    
+    Playwright error messages and traces lose their Python call-site
+    information, so this is opt-in via the UCI_PW_FAST environment variable.
+    """
+    
+    try:
+        from playwright._impl import _connection
+        
+        fast_inspect = types.SimpleNamespace(**vars(inspect))
+        fast_inspect.stack = lambda *args, **kwargs: []
+        _connection.inspect = fast_inspect
+        logger.debug("Playwright stack inspection disabled")
+    except (ImportError, AttributeError) as e:
+        logger.debug(f"Could not disable Playwright stack inspection: {e}")
+
 class UCIBrowserDownloader:
     """Browser automation for UCI Excel downloads using Playwright"""
     
@@ -26,11 +144,16 @@ class UCIBrowserDownloader:
         """
         self.output_dir = output_dir or Path.cwd() / 'data'
         self.output_dir.mkdir(exist_ok=True)
+        self.storage_state_file = self.output_dir / STORAGE_STATE_FILENAME
+        self.debug = os.environ.get(DEBUG_ENV) == '1'
         
         # Check if Playwright is available
         try:
             from playwright.async_api import async_playwright
             self._playwright_available = True
+            
+            if os.environ.get(FAST_PLAYWRIGHT_ENV) == '1':
+                _disable_playwright_stack_inspection()
         except ImportError:
             self._playwright_available = False
             logger.warning("Playwright not available. Install with: pip install playwright")
@@ -39,6 +162,14 @@ class UCIBrowserDownloader:
         """Check if browser automation is available"""
         return self._playwright_available
     
+    def is_fresh(self, year: str, ttl_seconds: int = FRESH_FILE_TTL_SECONDS) -> bool:
+        """Check if the Excel file for a year was downloaded within the TTL"""
+        output_file = self.output_dir / f"{year}.xls"
+        try:
+            return time.time() - output_file.stat().st_mtime < ttl_seconds
+        except FileNotFoundError:
+            return False
+    
     async def download_year(self, year: str, headless: bool = True) -> bool:
         """
         Download UCI Excel file for a specific year using browser automation
@@ -61,60 +192,10 @@ class UCIBrowserDownloader:
             from playwright.async_api import async_playwright
             
             async with async_playwright() as p:
-                # Launch browser with realistic settings
-                browser = await p.chromium.launch(
-                    headless=headless,
-                    args=[
-                        '--no-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-blink-features=AutomationControlled',
-                        '--disable-extensions'
-                    ]
-                )
-                
-                # Create context with realistic viewport and user agent
-                context = await browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36'
-                )
-                
-                page = await context.new_page()
+                browser = await self._launch_browser(p, headless)
                 
                 try:
-                    # Navigate to UCI calendar
-                    logger.info(f"📡 Navigating to UCI calendar page...")
-                    await page.goto(
-                        "https://www.uci.org/calendar/mtb/1voMyukVGR4iZMhMlDfRv0?discipline=MTB",
-                        wait_until="domcontentloaded",
-                        timeout=60000
-                    )
-                    
-                    # Wait for page to fully load
-                    logger.info(f"⏳ Waiting for page content to load...")
-                    await page.wait_for_timeout(5000)
-                    
-                    # Handle cookie consent and overlays
-                    await self._handle_overlays(page)
-                    
-                    # Take screenshot for debugging (in debug mode)
-                    if not headless:
-                        await page.screenshot(path=self.output_dir / f"debug_page_loaded_{year}.png")
-                    
-                    logger.info(f"✅ UCI page loaded successfully")
-                    
-                    # Handle year selection if needed
-                    await self._handle_year_selection(page, year)
-                    
-                    # Find and click download elements
-                    download_success = await self._trigger_excel_download(page, year)
-                    
-                    if download_success:
-                        logger.info(f"✅ Successfully downloaded {year} UCI calendar")
-                        return True
-                    else:
-                        logger.error(f"❌ Failed to download {year} UCI calendar")
-                        return False
-                        
+                    return await self._download_year_with_browser(browser, year, headless)
                 finally:
                     await browser.close()
                     
@@ -122,65 +203,226 @@ class UCIBrowserDownloader:
             logger.error(f"❌ Browser automation error: {e}")
             return False
     
+    async def _download_year_with_browser(self, browser, year: str, headless: bool) -> bool:
+        """
+        Download one year in a fresh context on an already-running browser
+        
+        Contexts are cheap compared to launching Chromium, so callers can keep
+        one browser alive and only pay for a new context per year.
+        
+        Args:
+            browser: Launched Playwright browser
+            year: Year to download (e.g. "2025")
+            headless: Whether the browser is headless
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        
+        context = await self._new_context(browser)
+        
+        try:
+            page = await context.new_page()
+            await self._open_calendar(page, year, headless)
+            
+            # Handle year selection and download
+            download_success = await self._pick_year_and_download(page, year)
+            
+            if download_success:
+                logger.info(f"✅ Successfully downloaded {year} UCI calendar")
+                
+                # Remember the accepted cookie consent for the next run
+                await self._save_storage_state(context, year)
+                return True
+            else:
+                logger.error(f"❌ Failed to download {year} UCI calendar")
+                return False
+                
+        finally:
+            await context.close()
+    
+    async def _launch_browser(self, playwright, headless: bool):
+        """Launch Chromium with realistic settings"""
+        return await playwright.chromium.launch(
+            headless=headless,
+            args=[
+                '--no-sandbox',
+                '--disable-dev-shm-usage',
+                '--disable-blink-features=AutomationControlled',
+                '--disable-extensions'
+            ]
+        )
+    
+    async def _new_context(self, browser):
+        """Create a browser context with realistic viewport and user agent"""
+        context_options = dict(
+            viewport={'width': 1920, 'height': 1080},
+            user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36',
+            accept_downloads=True
+        )
+        
+        # Restore cookies from a previous successful run, if any
+        if self.storage_state_file.exists():
+            try:
+                return await browser.new_context(storage_state=str(self.storage_state_file), **context_options)
+            except Exception as e:
+                logger.warning(f"⚠️  Could not restore saved browser state, starting fresh: {e}")
+        
+        return await browser.new_context(**context_options)
+    
+    async def _save_storage_state(self, context, year: str) -> None:
+        """Save the context's cookies/localStorage for later runs (atomically, as several years may finish at once)"""
+        partial_file = self.storage_state_file.with_name(f"{STORAGE_STATE_FILENAME}.{year}.part")
+        try:
+            await context.storage_state(path=partial_file)
+            os.replace(partial_file, self.storage_state_file)
+        except Exception as e:
+            logger.warning(f"⚠️  Could not save browser state: {e}")
+    
+    async def _open_calendar(self, page, year: str, headless: bool = True) -> None:
+        """
+        Navigate to the UCI calendar and clear any overlays
+        
+        Runs once for each year's page - every year gets its own browser
+        context, so nothing is carried over from other years' pages.
+        
+        Args:
+            page: Playwright page for the year being downloaded
+            year: Year being downloaded (used in debug screenshot filenames)
+            headless: Whether the browser is headless (page screenshot only when visible)
+        """
+        
+        # Navigate to UCI calendar
+        logger.info(f"📡 Navigating to UCI calendar page...")
+        await page.goto(
+            CALENDAR_URL,
+            wait_until="domcontentloaded",
+            timeout=60000
+        )
+        
+        # Wait for page to fully load (scripts fetching the calendar data)
+        logger.info(f"⏳ Waiting for page content to load...")
+        await self._wait_for_network_idle(page)
+        
+        # Handle cookie consent and overlays
+        await self._handle_overlays(page)
+        
+        # Take screenshot for debugging (in debug mode)
+        if not headless:
+            await self._debug_screenshot(page, f"debug_page_loaded_{year}")
+        
+        logger.info(f"✅ UCI page loaded successfully")
+    
+    async def _pick_year_and_download(self, page, year: str) -> bool:
+        """Select a year on the open calendar page and download its Excel file"""
+        
+        # Handle year selection if needed
+        await self._handle_year_selection(page, year)
+        
+        # Find and click download elements
+        return await self._trigger_excel_download(page, year)
+    
+    async def _debug_screenshot(self, page, name: str) -> None:
+        """Save a viewport JPEG screenshot as <output_dir>/<name>.jpg when debugging is enabled"""
+        if self.debug:
+            await page.screenshot(path=self.output_dir / f"{name}.jpg", type='jpeg', quality=60)
+    
+    @staticmethod
+    async def _probe(query, default):
+        """Await a quick page query, returning default if it takes over PROBE_TIMEOUT"""
+        try:
+            return await asyncio.wait_for(query, timeout=PROBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.debug("Page query timed out after %ss", PROBE_TIMEOUT)
+            return default
+    
+    @staticmethod
+    async def _wait_for_network_idle(page) -> None:
+        """Wait until the page stops making requests (best effort)"""
+        try:
+            await page.wait_for_load_state('networkidle', timeout=NETWORK_IDLE_TIMEOUT)
+        except Exception as e:
+            logger.debug(f"Network did not go idle, continuing: {e}")
+    
+    @staticmethod
+    def _union_locator(page, selectors: List[str], visible_only: bool = False):
+        """
+        Combine selectors into a single locator matching any of them
+        
+        Matches come back in document order, so only use this where any match
+        will do; _first_match keeps the selectors' priority.
+        """
+        suffix = ' >> visible=true' if visible_only else ''
+        locator = page.locator(selectors[0] + suffix)
+        for selector in selectors[1:]:
+            locator = locator.or_(page.locator(selector + suffix))
+        return locator
+    
+    async def _first_match(self, page, selectors: List[str]):
+        """
+        Find the element for the highest-priority selector that matches
+        
+        All selectors are counted concurrently, then the first one in list
+        order with a match wins.
+        
+        Args:
+            page: Playwright page
+            selectors: Selectors, most preferred first
+            
+        Returns:
+            Locator for that selector's first element, or None if nothing matches
+        """
+        locators = [page.locator(selector) for selector in selectors]
+        counts = await asyncio.gather(*(self._probe(locator.count(), 0) for locator in locators))
+        for selector, locator, count in zip(selectors, locators, counts):
+            if count:
+                logger.debug("Matched selector %s", selector)
+                return locator.first
+        return None
+    
     async def _handle_overlays(self, page) -> None:
         """Handle cookie consent and other overlays that might block interactions"""
         
         logger.info(f"🍪 Checking for overlays (cookies, popups, etc.)...")
         
+        # Locators are built per page (no browser round-trip) since several
+        # pages may be open at once during bulk downloads
+        cookie_loc = self._union_locator(page, COOKIE_SELECTORS, visible_only=True)
+        overlay_close_loc = self._union_locator(page, OVERLAY_CLOSE_SELECTORS, visible_only=True)
+        
         try:
-            # Cookie consent patterns
-            cookie_selectors = [
-                '#cookiescript_accept',
-                '#cookiescript_accept_all',
-                'button:has-text("Accept")',
-                'button:has-text("Accept All")',
-                'button:has-text("OK")',
-                '[data-testid="accept-cookies"]',
-                '.cookie-accept',
-                '.accept-cookies'
-            ]
-            
-            for selector in cookie_selectors:
+            # Accept cookies if a consent banner is showing (with restored
+            # storage state it usually is not, so check before waiting on it)
+            if await self._probe(cookie_loc.count(), 0):
                 try:
-                    element = await page.query_selector(selector)
-                    if element and await element.is_visible():
-                        logger.info(f"🍪 Found cookie consent: {selector}")
-                        await element.click()
-                        await page.wait_for_timeout(1000)
-                        logger.info(f"✅ Accepted cookies")
-                        break
+                    await cookie_loc.first.click(timeout=OPTIONAL_CLICK_TIMEOUT)
+                    logger.info(f"🍪 Found cookie consent")
+                    await cookie_loc.first.wait_for(state='hidden', timeout=OPTIONAL_CLICK_TIMEOUT)
+                    logger.info(f"✅ Accepted cookies")
                 except Exception:
-                    continue
+                    pass
             
             # Close any remaining overlays
-            overlay_selectors = [
-                '[aria-label="Close"]',
-                'button:has-text("Close")',
-                '.modal-close',
-                '.popup-close',
-                '.overlay-close'
-            ]
-            
-            for selector in overlay_selectors:
+            for _ in range(await self._probe(overlay_close_loc.count(), 0)):
                 try:
-                    element = await page.query_selector(selector)
-                    if element and await element.is_visible():
-                        logger.info(f"❌ Found overlay close button: {selector}")
-                        await element.click()
-                        await page.wait_for_timeout(500)
+                    await overlay_close_loc.first.click(timeout=OPTIONAL_CLICK_TIMEOUT)
+                    logger.info(f"❌ Closed overlay")
                 except Exception:
-                    continue
+                    break
                     
             # Wait for overlays to disappear
-            await page.wait_for_timeout(2000)
+            try:
+                await overlay_close_loc.first.wait_for(state='hidden', timeout=OPTIONAL_CLICK_TIMEOUT)
+            except Exception:
+                pass
             
         except Exception as e:
-            logger.warning(f"⚠️  Overlay handling error (continuing): {e}")
+            logger.warning("⚠️  Overlay handling error (continuing): %s", e)
     
     async def _handle_year_selection(self, page, year: str) -> None:
         """Handle year selection in UCI interface"""
         
-        logger.info(f"🔍 Checking for year selection (target: {year})...")
+        logger.info("🔍 Checking for year selection (target: %s)...", year)
         
         try:
             # Look for year selector elements
@@ -191,100 +433,196 @@ class UCIBrowserDownloader:
                 f'button:has-text("{year}")'
             ]
             
-            for selector in year_selectors:
-                element = await page.query_selector(selector)
-                if element:
-                    logger.info(f"📅 Found year selector: {selector}")
-                    await element.click()
-                    await page.wait_for_timeout(1000)
+            year_loc = await self._first_match(page, year_selectors)
+            if year_loc is not None:
+                # Re-selecting the season already shown would only reload it
+                if await self._probe(page.evaluate(DISPLAYED_YEAR_SCRIPT, year), False):
+                    logger.info("📅 %s is already displayed", year)
                     return
+                
+                outer_html = await self._probe(year_loc.evaluate('e => e.outerHTML.slice(0, 80)'), '?')
+                logger.info("📅 Found year selector: %s", outer_html)
+                await year_loc.click(timeout=OPTIONAL_CLICK_TIMEOUT)
+                await self._wait_for_network_idle(page)
+                return
             
             logger.info(f"ℹ️  No year selector found - assuming current year is displayed")
             
         except Exception as e:
-            logger.warning(f"⚠️  Year selection error (continuing): {e}")
+            logger.warning("⚠️  Year selection error (continuing): %s", e)
     
     async def _trigger_excel_download(self, page, year: str) -> bool:
         """Trigger Excel file download"""
         
         logger.info(f"🔍 Looking for Excel download elements...")
         
+        excel_format_loc = self._union_locator(page, EXCEL_FORMAT_SELECTORS)
+        
         try:
-            # Look for download button/link patterns
-            download_selectors = [
-                'text="Download season"',
-                'text="Download"',
-                '[aria-label*="Download"]',
-                'a[href*="excel"]',
-                'a[href*=".xls"]',
-                'button:has-text("Download")',
-                '.download-button',
-                '#download-button'
-            ]
-            
-            download_element = None
-            for selector in download_selectors:
-                element = await page.query_selector(selector)
-                if element:
-                    logger.info(f"📥 Found download element: {selector}")
-                    download_element = element
-                    break
-            
-            if not download_element:
+            download_element = await self._first_match(page, DOWNLOAD_SELECTORS)
+            if download_element is not None:
+                logger.info(f"📥 Found download element")
+            else:
                 logger.error(f"❌ Could not find download button")
-                await page.screenshot(path=self.output_dir / f"debug_no_download_button_{year}.png")
+                await self._debug_screenshot(page, f"debug_no_download_button_{year}")
                 return False
             
-            # Set up download handler
-            async with page.expect_download(timeout=30000) as download_info:
+            output_file = self.output_dir / f"{year}.xls"
+            
+            # Set up download handler before clicking, in case the button
+            # downloads straight away instead of opening a format menu
+            download_task = asyncio.ensure_future(page.wait_for_event('download', timeout=DOWNLOAD_TIMEOUT))
+            
+            try:
                 logger.info(f"🖱️  Clicking download button...")
-                await download_element.click()
+                await download_element.click(timeout=CLICK_TIMEOUT)
                 
-                # Look for XLS/Excel specific option
-                await page.wait_for_timeout(1000)
-                
-                excel_selectors = [
-                    'text="xls"',
-                    'text="Excel"', 
-                    'a[href*=".xls"]',
-                    '[data-format="xls"]'
-                ]
+                # Look for XLS/Excel specific option (a menu may open first)
+                try:
+                    await excel_format_loc.first.wait_for(state='visible', timeout=OPTIONAL_CLICK_TIMEOUT)
+                except Exception:
+                    pass
                 
-                for selector in excel_selectors:
-                    excel_element = await page.query_selector(selector)
-                    if excel_element:
-                        logger.info(f"📊 Found Excel format option: {selector}")
-                        await excel_element.click()
-                        break
-            
-            # Handle the download
-            download = await download_info.value
-            
-            # Save the file
-            output_file = self.output_dir / f"{year}.xls"
-            await download.save_as(output_file)
+                # A plain link can be fetched directly, skipping the download manager
+                if not await self._fetch_excel_link(page, output_file):
+                    excel_element = await self._first_match(page, EXCEL_FORMAT_SELECTORS)
+                    if excel_element is not None:
+                        logger.info(f"📊 Found Excel format option")
+                        await excel_element.click(timeout=CLICK_TIMEOUT)
+                    
+                    # Handle the download
+                    download = await download_task
+                    await download.save_as(output_file)
+            finally:
+                download_task.cancel()
+                # A wait that already timed out (e.g. during a slow direct
+                # fetch) must have its exception retrieved, or asyncio logs it
+                if download_task.done() and not download_task.cancelled():
+                    download_task.exception()
             
             # Verify download
             if output_file.exists() and output_file.stat().st_size > 0:
                 file_size = output_file.stat().st_size
-                logger.info(f"✅ Download saved: {output_file} ({file_size} bytes)")
+                logger.info("✅ Download saved: %s (%d bytes)", output_file, file_size)
                 return True
             else:
                 logger.error(f"❌ Download failed or file empty")
                 return False
                 
         except Exception as e:
-            logger.error(f"❌ Download trigger error: {e}")
-            await page.screenshot(path=self.output_dir / f"debug_download_error_{year}.png")
+            logger.error("❌ Download trigger error: %s", e)
+            await self._debug_screenshot(page, f"debug_download_error_{year}")
             return False
     
-    async def download_multiple_years(self, years: List[str], headless: bool = True) -> Dict[str, bool]:
+    async def _fetch_excel_link(self, page, output_file: Path) -> bool:
         """
-        Download multiple years sequentially
+        Fetch the spreadsheet through a direct link on the page, if there is one
+        
+        Uses the page's request context, so the browser's cookies are sent.
+        
+        Args:
+            page: Playwright page with the download menu open
+            output_file: Where to save the spreadsheet
+            
+        Returns:
+            True if the file was fetched, False to fall back to a browser download
+        """
+        
+        link = page.locator(EXCEL_LINK_SELECTOR).first
+        partial_file = output_file.with_name(f"{output_file.name}.part")
+        
+        try:
+            if not await self._probe(link.count(), 0):
+                return False
+            
+            href = await link.get_attribute('href', timeout=OPTIONAL_CLICK_TIMEOUT)
+            if href is None:
+                return False
+            
+            response = await page.request.get(urljoin(page.url, href))
+            if not response.ok:
+                logger.warning("⚠️  Direct Excel link returned %d, using browser download", response.status)
+                return False
+            
+            content_type = response.headers.get('content-type', '').lower()
+            if not any(fragment in content_type for fragment in EXCEL_CONTENT_TYPES):
+                logger.warning("⚠️  Direct Excel link returned %s, using browser download", content_type or 'no content type')
+                return False
+            
+            body = await response.body()
+            if not body:
+                logger.warning("⚠️  Direct Excel link returned an empty file, using browser download")
+                return False
+            
+            # Replace the previous file only once the new one is fully written
+            partial_file.write_bytes(body)
+            os.replace(partial_file, output_file)
+            
+        except Exception as e:
+            logger.warning("⚠️  Direct Excel link fetch failed, using browser download: %s", e)
+            partial_file.unlink(missing_ok=True)
+            return False
+        
+        logger.info("🔗 Fetched Excel file directly from %s", href)
+        return True
+    
+    async def _download_pending_years(self, years: List[str], headless: bool,
+                                      results: Dict[str, bool], concurrency: int,
+                                      max_retries: int) -> None:
+        """Download years concurrently on one shared browser, recording each outcome in results"""
+        
+        try:
+            from playwright.async_api import async_playwright
+            
+            async with async_playwright() as p:
+                browser = await self._launch_browser(p, headless)
+                
+                try:
+                    # Each year gets its own context and page, so years share
+                    # no page state; the semaphore bounds how many run at once
+                    semaphore = asyncio.Semaphore(concurrency)
+                    
+                    async def download_one(year: str) -> None:
+                        async with semaphore:
+                            logger.info(f"\n📅 Processing year {year}...")
+                            try:
+                                results[year] = await self._download_year_with_browser(browser, year, headless)
+                            except Exception as e:
+                                logger.error(f"❌ Browser automation error for {year}: {e}")
+                                results[year] = False
+                    
+                    await asyncio.gather(*(download_one(year) for year in years))
+                    
+                    # Retry failed years with backoff while the browser is still up
+                    for attempt in range(max_retries):
+                        failed = [year for year in years if not results.get(year)]
+                        if not failed:
+                            break
+                        
+                        wait = 2 ** attempt
+                        logger.info(f"🔄 Retrying {', '.join(failed)} in {wait}s...")
+                        await asyncio.sleep(wait)
+                        await asyncio.gather(*(download_one(year) for year in failed))
+                        
+                finally:
+                    await browser.close()
+                    
+        except Exception as e:
+            logger.error(f"❌ Browser automation error: {e}")
+    
+    async def download_multiple_years(self, years: List[str], headless: bool = True,
+                                      force: bool = False,
+                                      concurrency: Optional[int] = None,
+                                      max_retries: int = BULK_RETRY_ATTEMPTS) -> Dict[str, bool]:
+        """
+        Download multiple years concurrently in one browser
         
         Args:
             years: List of years to download
             headless: Whether to run browser in headless mode
+            force: Re-download years even if a recent file already exists
+            concurrency: Maximum years downloaded at once (defaults to min(3, pending years))
+            max_retries: Extra attempts for years that failed, on the same browser
             
         Returns:
             Dictionary with year -> success status
@@ -294,42 +632,53 @@ class UCIBrowserDownloader:
         
         logger.info(f"🚀 Starting bulk download for years: {', '.join(years)}")
         
+        # Skip years downloaded recently
+        pending = []
         for year in years:
-            logger.info(f"\n📅 Processing year {year}...")
-            success = await self.download_year(year, headless)
-            results[year] = success
-            
-            # Add delay between downloads to be respectful
-            if len(years) > 1:
-                logger.info(f"⏸️  Waiting 3 seconds before next download...")
-                await asyncio.sleep(3)
+            if not force and self.is_fresh(year):
+                logger.info(f"⏭️  {year}.xls downloaded recently - skipping")
+                results[year] = True
+            else:
+                pending.append(year)
+        
+        if pending and not self._playwright_available:
+            logger.error("Playwright not available for browser automation")
+        elif pending:
+            await self._download_pending_years(pending, headless, results,
+                                               concurrency or min(3, len(pending)), max_retries)
+        
+        # Years not reached because of an error count as failures
+        results = {year: results.get(year, False) for year in years}
         
         # Summary
         successful = sum(1 for success in results.values() if success)
         total = len(results)
         
-        logger.info(f"\n📊 Download Summary:")
-        logger.info(f"   Total attempts: {total}")
-        logger.info(f"   Successful: {successful}")
-        logger.info(f"   Failed: {total - successful}")
-        
-        for year, success in results.items():
-            status = "✅" if success else "❌"
-            logger.info(f"   {status} {year}")
+        # One log record for the whole summary
+        if logger.isEnabledFor(logging.INFO):
+            lines = [
+                f"\n📊 Download Summary:",
+                f"   Total attempts: {total}",
+                f"   Successful: {successful}",
+                f"   Failed: {total - successful}"
+            ]
+            lines.extend(f"   {'✅' if success else '❌'} {year}" for year, success in results.items())
+            logger.info("\n".join(lines))
         
         return results
 
-def discover_available_years() -> List[str]:
-    """Discover available years to download"""
+@functools.lru_cache(maxsize=1)
+def discover_available_years() -> Tuple[str, ...]:
+    """Discover available years to download (cached for the process lifetime)"""
     
     current_year = datetime.now().year
     
     # Try current year and next 2 years (UCI often has future seasons)
-    years = [
+    years = (
         str(current_year),
         str(current_year + 1),
         str(current_year + 2)
-    ]
+    )
     
     logger.info(f"🔍 Target years for download: {', '.join(years)}")
     return years
@@ -352,7 +701,8 @@ async def download_uci_year(year: str, output_dir: Optional[Path] = None, headle
 
 async def download_uci_bulk(years: Optional[List[str]] = None, 
                            output_dir: Optional[Path] = None, 
-                           headless: bool = True) -> Dict[str, bool]:
+                           headless: bool = True,
+                           force: bool = False) -> Dict[str, bool]:
     """
     Convenience function to download multiple years
     
@@ -360,12 +710,13 @@ async def download_uci_bulk(years: Optional[List[str]] = None,
         years: List of years to download (defaults to current + next 2)
         output_dir: Directory to save files
         headless: Whether to run in headless mode
+        force: Re-download years even if a recent file already exists
         
     Returns:
         Dictionary with year -> success status
     """
     if years is None:
-        years = discover_available_years()
+        years = list(discover_available_years())
     
     downloader = UCIBrowserDownloader(output_dir)
-    return await downloader.download_multiple_years(years, headless)
\ No newline at end of file
+    return await downloader.download_multiple_years(years, headless, force)
\ No newline at end of file
@@ -5,23 +5,52 @@ Converts UCI MTB events to iCal format
 """
 
 from icalendar import Calendar, Event
-from datetime import datetime, timedelta
-import pytz
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import os
 import uuid
 import logging
-from typing import List, Dict
-# Excel parser is the primary data source
+from typing import Iterator, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Excel parser is the primary data source (type hints only - importing it
+    # at runtime would load pandas just to generate a calendar)
+    from .excel_parser import UCIEvent
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Categories attached to every event (the event's own category is appended)
+BASE_CATEGORIES = ('MTB', 'Cycling', 'UCI')
+
+# Optional event fields listed in the description when set: (label, UCIEvent attribute)
+DESCRIPTION_FIELDS = (
+    ('Country', 'country'),
+    ('Calendar', 'calendar'),
+    ('Class', 'event_class'),
+    ('Email', 'email'),
+    ('Website', 'url')
+)
+
+# Closing line of a serialized calendar
+ICAL_FOOTER = b'END:VCALENDAR\r\n'
+
+# Write buffer for streaming events to the .ics file
+ICAL_WRITE_BUFFER = 1024 * 1024
+
+def _random_uids(count: int) -> Iterator[str]:
+    """Yield count random (version 4) UUID hex strings from a single urandom read"""
+    rand = os.urandom(16 * count)
+    for i in range(0, len(rand), 16):
+        yield uuid.UUID(bytes=rand[i:i + 16], version=4).hex
+
 class CalendarGenerator:
     def __init__(self):
-        self.timezone = pytz.UTC
+        self.timezone = timezone.utc
         self.events = []  # Allow setting events directly
         
-    def create_calendar(self, events: List[Dict]) -> Calendar:
-        """Create an iCal calendar from event data"""
+    def _new_calendar(self) -> Calendar:
+        """Create an empty calendar carrying only the calendar metadata"""
         cal = Calendar()
         
         # Calendar metadata
@@ -32,30 +61,37 @@ class CalendarGenerator:
         cal.add('x-wr-calname', 'UCI MTB Calendar')
         cal.add('x-wr-caldesc', 'UCI Mountain Bike Calendar Events')
         cal.add('x-wr-timezone', 'UTC')
+        return cal
+    
+    def create_calendar(self, events: List['UCIEvent']) -> Calendar:
+        """Create an iCal calendar from event data"""
+        cal = self._new_calendar()
         
-        # Add events
-        for event_data in events:
-            event = self.create_event(event_data)
-            if event:
-                cal.add_component(event)
+        # Add events (all stamped with the same build time) in a single
+        # extend - add_component is just an append to subcomponents
+        dtstamp = datetime.now(self.timezone)
+        created = (self.create_event(event_data, dtstamp, uid)
+                   for event_data, uid in zip(events, _random_uids(len(events))))
+        cal.subcomponents.extend(event for event in created if event)
         
         logger.info(f"Created calendar with {len(events)} events")
         return cal
     
-    def create_event(self, event_data: Dict) -> Event:
-        """Create an iCal event from event data"""
+    def create_event(self, event_data: 'UCIEvent', dtstamp: Optional[datetime] = None,
+                     uid: Optional[str] = None) -> Event:
+        """Create an iCal event from event data (dtstamp defaults to now, uid to a new uuid4)"""
         try:
             event = Event()
             
             # Required fields
-            event.add('uid', str(uuid.uuid4()))
-            event.add('dtstamp', datetime.now(self.timezone))
+            event.add('uid', uid or uuid.uuid4().hex)
+            event.add('dtstamp', dtstamp or datetime.now(self.timezone))
             
             # Event details
-            event.add('summary', event_data['title'])
+            event.add('summary', event_data.title)
             
             # Handle date - assume all-day event if no time specified
-            event_date = event_data['date']
+            event_date = event_data.date
             if isinstance(event_date, datetime):
                 if event_date.time() == event_date.time().min:
                     # All-day event
@@ -63,70 +99,61 @@ class CalendarGenerator:
                     event.add('dtend', (event_date + timedelta(days=1)).date())
                 else:
                     # Timed event
-                    event_date = self.timezone.localize(event_date) if event_date.tzinfo is None else event_date
+                    event_date = event_date if event_date.tzinfo else event_date.replace(tzinfo=self.timezone)
                     event.add('dtstart', event_date)
                     event.add('dtend', event_date + timedelta(hours=3))  # Default 3-hour duration
             
             # Handle end date for multi-day events
-            if event_data.get('end_date'):
-                end_date = event_data['end_date']
+            if event_data.end_date:
+                end_date = event_data.end_date
                 if isinstance(end_date, datetime):
                     if end_date.time() == end_date.time().min:
                         # For all-day events, iCal DTEND should be one day after the last day (exclusive)
                         event.add('dtend', (end_date + timedelta(days=1)).date())
                     else:
-                        end_date = self.timezone.localize(end_date) if end_date.tzinfo is None else end_date
+                        end_date = end_date if end_date.tzinfo else end_date.replace(tzinfo=self.timezone)
                         event.add('dtend', end_date)
             
             # Optional fields
-            if event_data.get('location'):
-                event.add('location', event_data['location'])
+            if event_data.location:
+                event.add('location', event_data.location)
             
-            if event_data.get('url'):
-                event.add('url', event_data['url'])
+            if event_data.url:
+                event.add('url', event_data.url)
             
             # Build comprehensive description for Excel-sourced events
             description_parts = []
             
-            # Basic info
-            if event_data.get('venue') and event_data['venue'] != event_data.get('location', ''):
-                description_parts.append(f"Venue: {event_data['venue']}")
-            
-            if event_data.get('country'):
-                description_parts.append(f"Country: {event_data['country']}")
-            
-            # UCI-specific fields
-            if event_data.get('calendar'):
-                description_parts.append(f"Calendar: {event_data['calendar']}")
+            # Venue only when it adds something to the location
+            if event_data.venue and event_data.venue != event_data.location:
+                description_parts.append(f"Venue: {event_data.venue}")
             
-            if event_data.get('class'):
-                description_parts.append(f"Class: {event_data['class']}")
-            
-            if event_data.get('email'):
-                description_parts.append(f"Email: {event_data['email']}")
-            
-            if event_data.get('url'):
-                description_parts.append(f"Website: {event_data['url']}")
+            # Country and UCI-specific fields
+            description_parts.extend(
+                f"{label}: {value}"
+                for label, attr in DESCRIPTION_FIELDS
+                if (value := getattr(event_data, attr))
+            )
             
             # Add source info
-            if event_data.get('source'):
-                description_parts.append(f"\nSource: {event_data['source']}")
+            if event_data.source:
+                description_parts.append(f"\nSource: {event_data.source}")
             
             if description_parts:
                 event.add('description', "\n".join(description_parts))
-            elif event_data.get('url'):
-                event.add('description', f"More info: {event_data['url']}")
+            elif event_data.url:
+                event.add('description', f"More info: {event_data.url}")
             
             # Add categories
-            categories = ['MTB', 'Cycling', 'UCI']
-            if event_data.get('category'):
-                categories.append(event_data['category'])
-            event.add('categories', categories)
+            if event_data.category:
+                event.add('categories', [*BASE_CATEGORIES, event_data.category])
+            else:
+                event.add('categories', BASE_CATEGORIES)
             
             return event
             
         except Exception as e:
-            logger.error(f"Error creating event for {event_data.get('title', 'Unknown')}: {e}")
+            logger.error(f"Error creating event for {getattr(event_data, 'title', 'Unknown')}: {e}")
             return None
     
     def generate_ical_file(self, filename: str = 'calendar.ics') -> bool:
@@ -139,13 +166,27 @@ class CalendarGenerator:
                 logger.warning("No events provided, creating empty calendar")
                 events = []
             
-            # Create calendar
-            calendar = self.create_calendar(events)
-            
-            # Write to file
-            with open(filename, 'wb') as f:
-                f.write(calendar.to_ical())
-            
+            # Serialize the metadata-only calendar and split off its footer,
+            # then stream each event between header and footer so only one
+            # serialized event is held in memory at a time
+            header = self._new_calendar().to_ical()[:-len(ICAL_FOOTER)]
+            dtstamp = datetime.now(self.timezone)
+            
+            # Write to a temporary file, replacing the target only once complete
+            partial_file = Path(f"{filename}.part")
+            try:
+                with open(partial_file, 'wb', buffering=ICAL_WRITE_BUFFER) as f:
+                    f.write(header)
+                    for event_data, uid in zip(events, _random_uids(len(events))):
+                        event = self.create_event(event_data, dtstamp, uid)
+                        if event:
+                            f.write(event.to_ical())
+                    f.write(ICAL_FOOTER)
+                os.replace(partial_file, filename)
+            finally:
+                partial_file.unlink(missing_ok=True)
+            
+            logger.info(f"Created calendar with {len(events)} events")
             logger.info(f"Successfully generated {filename} with {len(events)} events")
             return True
             
@@ -4,7 +4,13 @@ UCI Excel Parser Module
 Parses UCI MTB calendar data from Excel downloads
 """
 
+import os
+import bisect
+import json
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Optional
@@ -12,13 +18,129 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Prefer the much faster Rust-based calamine reader when it is installed;
+# otherwise let pandas pick its default engine from the file contents
+# (openpyxl for UCI downloads, which pandas already opens read-only and
+# streams row by row, so the sheet is never held as openpyxl cells)
+try:
+    import python_calamine  # noqa: F401
+    EXCEL_ENGINE = 'calamine'
+except ImportError:
+    EXCEL_ENGINE = None
+
+# Parsed events are cached next to each workbook as Parquet when pyarrow is
+# installed, so unchanged files skip the (much slower) Excel read
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_CACHE = True
+except ImportError:
+    PARQUET_CACHE = False
+
+# Suffix replacing the workbook's own for its Parquet cache file
+PARQUET_CACHE_SUFFIX = '.cache.parquet'
+
+# Bump whenever a parsing change alters the cached events frame, so caches
+# written by older code are ignored
+PARQUET_CACHE_VERSION = 1
+
+# Parquet metadata key recording the cache version and the workbook's
+# mtime/size the cache was built from
+PARQUET_CACHE_SOURCE_KEY = b'uci_calendar.source'
+
+# Sheet row (0-based) holding the column headers - the rows above it
+# contain the title and spacing
+HEADER_ROW = 4
+
+# Excel column headers -> identifiers used for the parsed columns
+COLUMN_NAMES = {
+    'Date From': 'date_from',
+    'Date To': 'date_to',
+    'Name': 'name',
+    'Venue': 'venue',
+    'Country': 'country',
+    'Category': 'category',
+    'Calendar': 'calendar',
+    'Class': 'event_class',
+    'EMail': 'email',
+    'Website': 'website'
+}
+
+# filter_events criteria -> UCIEvent attribute they match against
+FILTER_ATTRIBUTES = {
+    'country': 'country',
+    'class': 'event_class',
+    'calendar': 'calendar',
+    'category': 'category'
+}
+
+@dataclass(frozen=True, slots=True)
+class UCIEvent:
+    """A single UCI calendar event (immutable, hashable, compact)"""
+    title: str
+    date: datetime
+    end_date: Optional[datetime] = None
+    location: str = ''
+    venue: str = ''
+    country: str = ''
+    category: str = 'MTB'
+    calendar: str = ''
+    event_class: str = ''
+    email: str = ''
+    url: str = ''
+    source: str = 'uci_excel'
+
+# Free-text columns, cleaned to plain strings ('' when missing)
+TEXT_COLUMNS = ('name', 'venue', 'country', 'category', 'calendar', 'event_class', 'email', 'website')
+
+def _clean_column(column: pd.Series) -> pd.Series:
+    """
+    Clean a text column: strip whitespace, and use '' for missing values
+    
+    Text columns are read with the 'string' dtype, so empty cells arrive as
+    pd.NA rather than NaN floats that would need spotting as 'nan' strings.
+    """
+    return column.str.strip().fillna('')
+
+def _parse_excel_file(file_path: str) -> List[UCIEvent]:
+    """Parse a single file in a worker process (module-level so it can be pickled)"""
+    logger.info(f"Processing file: {file_path}")
+    return UCIExcelParser().parse_excel_file(file_path)
+
 class UCIExcelParser:
     """Parser for UCI MTB calendar Excel files"""
     
     def __init__(self):
         self.events = []
+        self._dates = []  # Start dates of self.events, kept sorted for bisect
+        self._events_df = None  # Column view of self.events, see events_df
     
-    def parse_excel_file(self, file_path: str) -> List[Dict]:
+    def _store_events(self, events: List[UCIEvent]) -> List[UCIEvent]:
+        """Store events sorted by start date, with a parallel list of dates"""
+        self.events = sorted(events, key=lambda e: e.date)
+        self._dates = [e.date for e in self.events]
+        self._events_df = None
+        return self.events
+    
+    @property
+    def events_df(self) -> pd.DataFrame:
+        """
+        The parsed events as a DataFrame, built on first use
+        
+        Row i describes self.events[i]. Upper-cased copies of the filterable
+        columns (e.g. '_country_up') are precomputed for filter_events.
+        """
+        
+        if self._events_df is None:
+            columns = ('date', *dict.fromkeys(FILTER_ATTRIBUTES.values()))
+            df = pd.DataFrame({column: [getattr(e, column) for e in self.events] for column in columns})
+            for key, attr in FILTER_ATTRIBUTES.items():
+                df[f'_{key}_up'] = df[attr].astype(str).str.upper()
+            self._events_df = df
+        
+        return self._events_df
+    
+    def parse_excel_file(self, file_path: str) -> List[UCIEvent]:
         """
         Parse UCI Excel file and return list of events
         
@@ -26,7 +148,7 @@ class UCIExcelParser:
             file_path: Path to the UCI Excel file
             
         Returns:
-            List of event dictionaries
+            List of UCIEvent records
         """
         
         file_path = Path(file_path)
@@ -37,95 +159,139 @@ class UCIExcelParser:
         logger.info(f"Parsing UCI Excel file: {file_path}")
         
         try:
-            # Read Excel file
-            df = pd.read_excel(file_path)
+            # Reuse the cached columns when the workbook hasn't changed since
+            events_frame = self._load_parquet_cache(file_path)
+            if events_frame is None:
+                events_frame = self._read_events_frame(file_path)
+                self._save_parquet_cache(file_path, events_frame)
             
-            # The headers are in row 3 (index 3)
-            # First few rows contain title and spacing
-            header_row = 3
+            # End date only for multi-day events (None rather than NaT otherwise)
+            end_dates = events_frame['end_date']
+            events_frame['end_date'] = end_dates.astype(object).where(end_dates.notna(), None)
             
-            # Get the headers
-            headers = df.iloc[header_row].tolist()
-            logger.debug(f"Headers: {headers}")
-            
-            # Create clean dataframe with proper headers
-            clean_df = df.iloc[header_row + 1:].copy()  # Skip header row
-            clean_df.columns = headers
-            
-            # Remove rows with no event name
-            clean_df = clean_df.dropna(subset=['Name'])
-            
-            logger.info(f"Found {len(clean_df)} events in Excel file")
-            
-            # Convert to our standard format
-            events = []
-            
-            for i, row in clean_df.iterrows():
-                try:
-                    event = self._parse_event_row(row)
-                    if event:
-                        events.append(event)
-                        
-                except Exception as e:
-                    logger.warning(f"Error parsing row {i}: {e}")
-                    continue
+            # Convert to our standard format: build every event from one
+            # to_dict('records') pass over the UCIEvent-shaped columns
+            events = [UCIEvent(**record) for record in events_frame.to_dict('records')]
             
             logger.info(f"Successfully converted {len(events)} events")
-            self.events = events
-            return events
+            return self._store_events(events)
             
         except Exception as e:
             logger.error(f"Error parsing Excel file: {e}")
             return []
     
-    def _parse_event_row(self, row) -> Optional[Dict]:
-        """Parse a single event row from the Excel data"""
+    def _read_events_frame(self, file_path: Path) -> pd.DataFrame:
+        """Read a UCI Excel file into a DataFrame with one UCIEvent-shaped row per event"""
+        
+        # Read only the columns we use, with the free-text ones read
+        # straight as strings rather than type-inferred
+        clean_df = pd.read_excel(
+            file_path,
+            header=HEADER_ROW,
+            usecols=list(COLUMN_NAMES),
+            dtype={header: 'string' for header, name in COLUMN_NAMES.items() if name in TEXT_COLUMNS},
+            engine=EXCEL_ENGINE
+        )
+        logger.debug(f"Headers: {clean_df.columns.tolist()}")
+        clean_df = clean_df.rename(columns=COLUMN_NAMES)
+        
+        # Remove rows with no event name (missing or whitespace only) up front,
+        # so none of the column work below is spent on them
+        clean_df = clean_df[clean_df['name'].str.strip().fillna('') != '']
+        
+        logger.info(f"Found {len(clean_df)} events in Excel file")
+        
+        # Parse date columns in one vectorized pass - UCI Excel uses US format (MM/DD/YYYY)
+        # Force US format parsing to avoid ambiguity with dayfirst=False
+        # This ensures 01/06/2025 is parsed as January 6th, not June 1st
+        for column in ('date_from', 'date_to'):
+            clean_df[column] = pd.to_datetime(clean_df[column], format='mixed', dayfirst=False, errors='coerce')
+        
+        # Skip events without valid start date
+        clean_df = clean_df.dropna(subset=['date_from'])
+        
+        # Build location string from the raw venue/country text: "venue, country",
+        # whichever one is present, or a placeholder - chosen in one np.select
+        venue = clean_df['venue'].fillna('')
+        country = clean_df['country'].fillna('')
+        has_venue = (venue != '').to_numpy()
+        has_country = (country != '').to_numpy()
+        clean_df['location'] = np.select(
+            [has_venue & has_country, has_venue, has_country],
+            [(venue + ', ' + country).to_numpy(object), venue.to_numpy(object), country.to_numpy(object)],
+            default='Unknown location'
+        )
+        
+        # Clean up text fields column by column
+        for column in TEXT_COLUMNS:
+            clean_df[column] = _clean_column(clean_df[column])
+        clean_df['category'] = clean_df['category'].mask(clean_df['category'] == '', 'MTB')
+        
+        # Shape the columns like UCIEvent (end date NaT when missing or same as the start)
+        return pd.DataFrame({
+            'title': clean_df['name'],
+            'date': clean_df['date_from'],
+            'end_date': clean_df['date_to'].where(clean_df['date_to'] != clean_df['date_from']),
+            'location': clean_df['location'],
+            'venue': clean_df['venue'],
+            'country': clean_df['country'],
+            'category': clean_df['category'],
+            'calendar': clean_df['calendar'],
+            'event_class': clean_df['event_class'],
+            'email': clean_df['email'],
+            'url': clean_df['website']
+        })
+    
+    def _load_parquet_cache(self, file_path: Path) -> Optional[pd.DataFrame]:
+        """Load the cached events frame for file_path, or None if missing or stale"""
+        
+        cache_file = file_path.with_suffix(PARQUET_CACHE_SUFFIX)
+        if not PARQUET_CACHE or not cache_file.exists():
+            return None
         
         try:
-            # Parse dates - UCI Excel uses US format (MM/DD/YYYY)
-            # Force US format parsing to avoid ambiguity with dayfirst=False
-            # This ensures 01/06/2025 is parsed as January 6th, not June 1st
-            date_from = pd.to_datetime(row['Date From'], format='mixed', dayfirst=False, errors='coerce')
-            date_to = pd.to_datetime(row['Date To'], format='mixed', dayfirst=False, errors='coerce')
-            
-            if pd.isna(date_from):
-                return None  # Skip events without valid start date
-            
-            # Build location string
-            venue = str(row['Venue']) if pd.notna(row['Venue']) else ''
-            country = str(row['Country']) if pd.notna(row['Country']) else ''
-            location = f"{venue}, {country}" if venue and country else venue or country or 'Unknown location'
-            
-            # Clean up fields
-            def clean_field(field):
-                """Clean field value, handling NaN and 'nan' strings"""
-                if pd.isna(field) or str(field).lower() == 'nan':
-                    return ''
-                return str(field).strip()
-            
-            # Build event
-            event = {
-                'title': clean_field(row['Name']),
-                'date': date_from,
-                'end_date': date_to if pd.notna(date_to) and date_to != date_from else None,
-                'location': location,
-                'venue': clean_field(row['Venue']),
-                'country': clean_field(row['Country']),
-                'category': clean_field(row['Category']) or 'MTB',
-                'calendar': clean_field(row['Calendar']),
-                'class': clean_field(row['Class']),
-                'email': clean_field(row['EMail']),
-                'url': clean_field(row['Website']),
-                'source': 'uci_excel'
-            }
-            
-            return event
+            # Only a cache built by this parser version from this exact
+            # workbook is valid (an older mtime can still be a new file,
+            # e.g. copied with cp -p)
+            metadata = pq.read_schema(cache_file).metadata or {}
+            if metadata.get(PARQUET_CACHE_SOURCE_KEY) != self._cache_source(file_path):
+                return None
             
+            events_frame = pd.read_parquet(cache_file)
+            logger.info(f"Loaded {len(events_frame)} events from cache: {cache_file.name}")
+            return events_frame
         except Exception as e:
-            logger.debug(f"Error parsing event row: {e}")
+            logger.warning(f"Ignoring unreadable cache {cache_file.name}: {e}")
             return None
     
-    def get_upcoming_events(self, from_date: Optional[datetime] = None) -> List[Dict]:
+    def _save_parquet_cache(self, file_path: Path, events_frame: pd.DataFrame):
+        """Cache the events frame next to file_path (best effort)"""
+        
+        if not PARQUET_CACHE:
+            return
+        
+        cache_file = file_path.with_suffix(PARQUET_CACHE_SUFFIX)
+        try:
+            table = pa.Table.from_pandas(events_frame, preserve_index=False)
+            table = table.replace_schema_metadata({
+                **(table.schema.metadata or {}),
+                PARQUET_CACHE_SOURCE_KEY: self._cache_source(file_path)
+            })
+            pq.write_table(table, cache_file)
+        except Exception as e:
+            logger.warning(f"Could not write cache {cache_file.name}: {e}")
+    
+    @staticmethod
+    def _cache_source(file_path: Path) -> bytes:
+        """Identify the workbook (and parser version) a Parquet cache is built from"""
+        stat = file_path.stat()
+        return json.dumps({
+            'version': PARQUET_CACHE_VERSION,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size
+        }).encode()
+    
+    def get_upcoming_events(self, from_date: Optional[datetime] = None) -> List[UCIEvent]:
         """
         Get upcoming events from the parsed data
         
@@ -139,12 +305,13 @@ class UCIExcelParser:
         if from_date is None:
             from_date = datetime.now()
         
-        upcoming = [e for e in self.events if e['date'] >= from_date]
+        # Events are sorted by date, so the upcoming ones are a tail slice
+        upcoming = self.events[bisect.bisect_left(self._dates, from_date):]
         
         logger.info(f"Found {len(upcoming)} upcoming events from {from_date.date()}")
         return upcoming
     
-    def filter_events(self, **criteria) -> List[Dict]:
+    def filter_events(self, **criteria) -> List[UCIEvent]:
         """
         Filter events by criteria
         
@@ -155,11 +322,15 @@ class UCIExcelParser:
             Filtered list of events
         """
         
-        filtered = self.events.copy()
+        # Combine one vectorized mask per criterion, then pick the matching events
+        df = self.events_df
+        mask = pd.Series(True, index=df.index)
         
         for key, value in criteria.items():
-            if key in ['country', 'class', 'calendar', 'category']:
-                filtered = [e for e in filtered if e.get(key, '').upper() == str(value).upper()]
+            if key in FILTER_ATTRIBUTES:
+                mask &= df[f'_{key}_up'] == str(value).upper()
+        
+        filtered = [self.events[i] for i in df.index[mask]]
         
         logger.info(f"Filtered to {len(filtered)} events with criteria: {criteria}")
         return filtered
@@ -170,21 +341,23 @@ class UCIExcelParser:
         if not self.events:
             return {}
         
+        # Each aggregation is a single vectorized pass over one column
+        df = self.events_df
         stats = {
-            'total_events': len(self.events),
-            'upcoming_events': len(self.get_upcoming_events()),
-            'countries': len(set(e['country'] for e in self.events if e['country'])),
-            'classes': list(set(e['class'] for e in self.events if e['class'])),
-            'calendars': list(set(e['calendar'] for e in self.events if e['calendar'])),
+            'total_events': len(df),
+            'upcoming_events': int((df['date'] >= datetime.now()).sum()),
+            'countries': int(df.loc[df['country'] != '', 'country'].nunique()),
+            'classes': df.loc[df['event_class'] != '', 'event_class'].unique().tolist(),
+            'calendars': df.loc[df['calendar'] != '', 'calendar'].unique().tolist(),
             'date_range': {
-                'earliest': min(e['date'] for e in self.events).date(),
-                'latest': max(e['date'] for e in self.events).date()
+                'earliest': df['date'].min().date(),
+                'latest': df['date'].max().date()
             }
         }
         
         return stats
     
-    def parse_multiple_files(self, file_paths: List[str]) -> List[Dict]:
+    def parse_multiple_files(self, file_paths: List[str]) -> List[UCIEvent]:
         """
         Parse multiple UCI Excel files and combine events
         
@@ -198,10 +371,16 @@ class UCIExcelParser:
         all_events = []
         successful_files = []
         
-        for file_path in file_paths:
-            logger.info(f"Processing file: {file_path}")
-            file_events = self.parse_excel_file(file_path)
-            
+        # Excel parsing is CPU-bound, so parse files in separate processes
+        # when there is more than one file and more than one CPU
+        workers = min(len(file_paths), os.cpu_count() or 1)
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                per_file_events = list(executor.map(_parse_excel_file, file_paths))
+        else:
+            per_file_events = list(map(_parse_excel_file, file_paths))
+        
+        for file_path, file_events in zip(file_paths, per_file_events):
             if file_events:
                 all_events.extend(file_events)
                 successful_files.append(Path(file_path).name)
@@ -215,7 +394,7 @@ class UCIExcelParser:
         
         for event in all_events:
             # Create a unique key for deduplication
-            key = (event['title'], event['date'].date(), event['location'])
+            key = (event.title, event.date.date(), event.location)
             
             if key not in seen:
                 seen.add(key)
@@ -227,5 +406,4 @@ class UCIExcelParser:
         
         logger.info(f"Successfully combined {len(unique_events)} unique events from {len(successful_files)} files: {', '.join(successful_files)}")
         
-        self.events = unique_events
-        return unique_events
\ No newline at end of file
+        return self._store_events(unique_events)
\ No newline at end of file
@@ -5,30 +5,59 @@ Creates an HTML page displaying UCI MTB calendar events for debugging and quick
 """
 
 from datetime import datetime
+from pathlib import Path
+import functools
+import html
 import json
 import logging
-from typing import List, Dict
-# Excel parser is the primary data source
+import os
+from operator import attrgetter
+from typing import List, Dict, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # Excel parser is the primary data source (type hints only - importing it
+    # at runtime would load pandas just to render the page)
+    from .excel_parser import UCIEvent
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Markup for a single event card, filled in with str.format_map (values
+# must already be HTML-escaped)
+EVENT_TEMPLATE = """
+        <div class="event-card">
+            <div class="event-header">
+                <h3 class="event-title">{title}</h3>
+                <div class="event-date">📅 {date_str}</div>
+            </div>
+            <div class="event-body">
+                <div class="event-location">📍 {location}</div>
+                {url_html}
+            </div>
+        </div>"""
+
+# Link shown on event cards that have a URL
+EVENT_URL_TEMPLATE = '<div class="event-url"><a href="{url}" target="_blank">🔗 More Information</a></div>'
+
 class HTMLGenerator:
+    # Template file contents, read once and shared by every instance
+    _template_cache = None
+    
     def __init__(self):
         self.events = []  # Allow setting events directly
         self.template = self._load_template()
     
     def _load_template(self):
-        """Load HTML template from file"""
-        from pathlib import Path
+        """Load HTML template from file (cached after the first successful read)"""
+        if HTMLGenerator._template_cache is not None:
+            return HTMLGenerator._template_cache
         
         template_file = Path(__file__).parent / 'templates' / 'debug_calendar.html'
         
         try:
-            with open(template_file, 'r', encoding='utf-8') as f:
-                template = f.read()
+            HTMLGenerator._template_cache = template_file.read_bytes().decode('utf-8')
             logger.info(f"Loaded HTML template from {template_file}")
-            return template
+            return HTMLGenerator._template_cache
         except Exception as e:
             logger.error(f"Failed to load template from {template_file}: {e}")
             # Fallback to a minimal template
@@ -42,12 +71,13 @@ class HTMLGenerator:
 </body>
 </html>"""
 
-    def format_date(self, date_obj: datetime) -> str:
-        """Format date for display"""
+    def format_date(self, date_obj: datetime, now: Optional[datetime] = None) -> str:
+        """Format date for display, relative to now (defaults to the current time)"""
         if not date_obj:
             return "Date TBD"
         
-        now = datetime.now()
+        if now is None:
+            now = datetime.now()
         diff = (date_obj - now).days
         
         # Use unambiguous format: "10 Jan 2025" (day month year)
@@ -62,38 +92,26 @@ class HTMLGenerator:
         else:
             return f"{date_str} ({abs(diff)} days ago)"
 
-    def generate_event_html(self, event: Dict) -> str:
-        """Generate HTML for a single event"""
-        title = event.get('title', 'Untitled Event')
-        date_str = self.format_date(event.get('date'))
-        location = event.get('location', 'Location TBD')
-        url = event.get('url', '')
-        
-        url_html = ""
-        if url:
-            url_html = f'<div class="event-url"><a href="{url}" target="_blank">🔗 More Information</a></div>'
-        
-        return f"""
-        <div class="event-card">
-            <div class="event-header">
-                <h3 class="event-title">{title}</h3>
-                <div class="event-date">📅 {date_str}</div>
-            </div>
-            <div class="event-body">
-                <div class="event-location">📍 {location}</div>
-                {url_html}
-            </div>
-        </div>"""
+    def generate_event_html(self, event: 'UCIEvent', now: Optional[datetime] = None,
+                            date_str: Optional[str] = None) -> str:
+        """Generate HTML for a single event (date_str defaults to format_date of its date)"""
+        return EVENT_TEMPLATE.format_map({
+            'title': html.escape(event.title),
+            'date_str': date_str or self.format_date(event.date, now),
+            'location': html.escape(event.location),
+            'url_html': EVENT_URL_TEMPLATE.format(url=html.escape(event.url)) if event.url else ''
+        })
 
-    def calculate_stats(self, events: List[Dict]) -> Dict:
+    def calculate_stats(self, events: List['UCIEvent'], now: Optional[datetime] = None) -> Dict:
         """Calculate statistics for the events"""
-        now = datetime.now()
-        upcoming_events = [e for e in events if e.get('date') and e['date'] > now]
+        if now is None:
+            now = datetime.now()
+        upcoming_events = [e for e in events if e.date and e.date > now]
         
         next_event_days = "N/A"
         if upcoming_events:
-            next_event = min(upcoming_events, key=lambda x: x['date'])
-            next_event_days = (next_event['date'] - now).days
+            next_event = min(upcoming_events, key=attrgetter('date'))
+            next_event_days = (next_event.date - now).days
         
         return {
             'total_events': len(events),
@@ -107,32 +125,42 @@ class HTMLGenerator:
             # Use pre-set events (must be provided externally)
             events = self.events
             
+            # Read the clock once so every relative date and timestamp on the
+            # page agrees
+            now = datetime.now()
+            
             # Calculate stats
-            stats = self.calculate_stats(events)
+            stats = self.calculate_stats(events, now)
             
-            # Generate events HTML
+            # Generate events HTML lazily - each card is written as soon as it
+            # is rendered rather than joined into one large string
             if events:
                 # Sort events by date
-                events_sorted = sorted([e for e in events if e.get('date')], 
-                                     key=lambda x: x['date'])
-                events_html = '\n'.join([self.generate_event_html(event) for event in events_sorted])
+                events_sorted = sorted((e for e in events if e.date), key=attrgetter('date'))
+                
+                # Many events share a start date, so format each date only once
+                format_date = functools.lru_cache(maxsize=None)(functools.partial(self.format_date, now=now))
+                events_html = (self.generate_event_html(event, now, format_date(event.date))
+                               for event in events_sorted)
             else:
-                events_html = '''
+                events_html = ['''
                 <div class="no-events">
                     <h3>🔍 No Events Found</h3>
                     <p>Either there are no upcoming events, or the scraper needs adjustment for the UCI website structure.</p>
-                </div>'''
+                </div>''']
             
-            # Fill template
+            # Fill the template on either side of the events placeholder
             try:
-                html_content = self.template.format(
-                    last_updated=datetime.now().strftime("%Y-%m-%d %H:%M UTC"),
-                    total_events=stats['total_events'],
-                    upcoming_events=stats['upcoming_events'],
-                    next_event_days=stats['next_event_days'],
-                    events_html=events_html,
-                    generation_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
-                )
+                head, _, tail = self.template.partition('{events_html}')
+                values = {
+                    'last_updated': now.strftime("%Y-%m-%d %H:%M UTC"),
+                    'total_events': stats['total_events'],
+                    'upcoming_events': stats['upcoming_events'],
+                    'next_event_days': stats['next_event_days'],
+                    'generation_time': now.strftime("%Y-%m-%d %H:%M:%S UTC")
+                }
+                head = head.format_map(values)
+                tail = tail.format_map(values)
             except KeyError as e:
                 logger.error(f"Template formatting error - missing key: {e}")
                 return False
@@ -140,9 +168,17 @@ class HTMLGenerator:
                 logger.error(f"Template formatting error - value error: {e}")
                 return False
             
-            # Write to file
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            # Stream the page (filled head, one event card at a time, filled
+            # tail) to a temporary file, replacing the target only once complete
+            partial_file = Path(f"{filename}.part")
+            try:
+                with open(partial_file, 'w', encoding='utf-8') as f:
+                    f.write(head)
+                    f.writelines(events_html)
+                    f.write(tail)
+                os.replace(partial_file, filename)
+            finally:
+                partial_file.unlink(missing_ok=True)
             
             logger.info(f"Successfully generated {filename} with {len(events)} events")
             return True
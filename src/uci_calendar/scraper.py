@@ -5,26 +5,159 @@ Scrapes UCI MTB calendar events and converts them to iCal format
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from bs4 import BeautifulSoup, NavigableString
+from dataclasses import dataclass, fields, replace
 from datetime import datetime, timedelta
 import re
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 import pytz
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Prefer BeautifulSoup's C-based lxml tree builder when it is installed;
+# the pure-Python html.parser is several times slower on the calendar page
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Cache fetched pages (revalidated with ETag / Last-Modified) when
+# requests-cache is installed; otherwise every scrape downloads the page
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None
+
+# requests-cache SQLite database name (stored in the user cache directory)
+HTTP_CACHE_NAME = 'uci_calendar_http'
+
+# Seconds a cached page is reused before it is revalidated (unless the
+# server's Cache-Control says otherwise)
+HTTP_CACHE_EXPIRE = 3600
+
+# Transient server errors retried by urllib3 with exponential backoff
+# (Retry-After is honoured)
+RETRY_POLICY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({'GET'}),
+    raise_on_status=False
+)
+
+# Connections kept alive per host, sized for concurrent page fetches
+HTTP_POOL_SIZE = 32
+
+# Classes of the page elements events are scraped from
+COMPETITION_CARD_CLASS = 'competition-card'
+CALENDAR_ITEM_CLASS = 'calendar-item__title'
+
+# Placeholders recorded for event fields missing from the page
+UNKNOWN_TITLE = "Unknown Event"
+NO_DATES = "No dates"
+NO_VENUE = "No venue"
+NO_LOCATION = "No location"
+UNKNOWN_VENUE = "Unknown venue"
+UNKNOWN_COUNTRY = "Unknown country"
+
+# Category of every scraped event (the calendar page only lists MTB)
+EVENT_CATEGORY = 'Mountain Bike'
+
+# Race hub link text on competition cards
+RACE_HUB_RE = re.compile(r'Race Hub')
+
+# UCI date range "30 May - 01 Jun 2025": start, end and its year (single
+# dates have no dash and are split directly in parse_uci_dates)
+UCI_DATES_RE = re.compile(
+    r'(?P<start>\d{1,2}\s+\w+)\s*-\s*(?P<end>\d{1,2}\s+\w+\s+(?P<year>\d{4}))'
+)
+
+# Four-digit years anywhere in a raw dates string (cheap staleness check)
+YEAR_RE = re.compile(r'\d{4}')
+
+# Lower-cased English month abbreviations (as in "01 Jun 2025") -> month number
+MONTHS = {name: number for number, name in enumerate(
+    ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'), start=1)}
+
+# Generic element scraping: numeric dates in text, title classes and location labels
+DATE_IN_TEXT_RE = re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{4}|\d{4}-\d{2}-\d{2}')
+TITLE_CLASS_RE = re.compile(r'title|name|event', re.I)
+LOCATION_TEXT_RE = re.compile(r'location|venue|city|country', re.I)
+
+@dataclass(frozen=True, slots=True)
+class RawEvent:
+    """An event as scraped from the page, before its dates are parsed"""
+    title: str
+    dates: str
+    venue: str
+    source: str
+    country: Optional[str] = None
+    detail_url: Optional[str] = None
+    race_hub_url: Optional[str] = None
+
+def _element_text(element, default: str) -> str:
+    """
+    Stripped text of an element, or default when the element is missing
+    
+    Elements holding a single text node (the usual case for card fields)
+    return it directly rather than walking every descendant like get_text.
+    """
+    if element is None:
+        return default
+    
+    text = element.string
+    if type(text) is NavigableString:
+        return text.strip()
+    return element.get_text(strip=True)
+
+def _parse_day_month_year(text: str) -> datetime:
+    """
+    Parse a "01 Jun 2025" date matched by the date regexes - same result as
+    strptime with '%d %b %Y', without re-parsing the format on every call
+    
+    Raises:
+        KeyError: Unknown month abbreviation
+        ValueError: Malformed text or impossible date
+    """
+    day, month, year = text.split()
+    return datetime(int(year), MONTHS[month.lower()], int(day))
+
 class UCICalendarScraper:
     def __init__(self):
         self.base_url = "https://www.uci.org/calendar/mtb/1voMyukVGR4iZMhMlDfRv0"
-        self.session = requests.Session()
+        if requests_cache:
+            self.session = requests_cache.CachedSession(
+                HTTP_CACHE_NAME,
+                backend='sqlite',
+                use_cache_dir=True,
+                expire_after=HTTP_CACHE_EXPIRE,
+                cache_control=True
+            )
+        else:
+            self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        
+        # One adapter (connection pool + retry policy) shared by both schemes
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE,
+                              max_retries=RETRY_POLICY)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
     
-    def fetch_calendar_page(self) -> Optional[str]:
-        """Fetch the UCI MTB calendar page with filters for relevant events"""
+    def fetch_calendar_page(self) -> Optional[bytes]:
+        """
+        Fetch the UCI MTB calendar page with filters for relevant events
+        
+        Returns the raw (already decompressed) bytes: the HTML parser works out
+        the charset itself, so response.text's decode (and its charset
+        guessing when the server sends none) is skipped.
+        """
         try:
             params = {
                 'discipline': 'MTB',
@@ -34,172 +167,193 @@ class UCICalendarScraper:
             }
             response = self.session.get(self.base_url, params=params, timeout=30)
             response.raise_for_status()
-            return response.text
+            return response.content
         except requests.RequestException as e:
             logger.error(f"Failed to fetch calendar page: {e}")
             return None
     
-    def parse_competition_cards(self, soup):
+    def parse_competition_cards(self, soup) -> List[RawEvent]:
         """Parse competition-card elements from carousel"""
-        events = []
-        competition_cards = soup.find_all('div', class_='competition-card')
+        cards = soup.find_all('div', class_=COMPETITION_CARD_CLASS)
+        return [event for event in map(self.parse_competition_card, cards) if event]
+    
+    def parse_competition_card(self, card) -> Optional[RawEvent]:
+        """Parse a single competition-card element"""
+        # Extract event name
+        name_elem = card.find('div', class_='competition-card__name')
+        name = _element_text(name_elem, UNKNOWN_TITLE)
         
-        for card in competition_cards:
-            try:
-                # Extract event name
-                name_elem = card.find('div', class_='competition-card__name')
-                name = name_elem.get_text(strip=True) if name_elem else "Unknown Event"
-                
-                # Extract dates
-                dates_elem = card.find('div', class_='competition-card__dates')
-                dates = dates_elem.get_text(strip=True) if dates_elem else "No dates"
-                
-                # Extract venue
-                venue_elem = card.find('div', class_='competition-card__venue')
-                venue = venue_elem.get_text(strip=True) if venue_elem else "No venue"
-                
-                # Extract race hub link
-                race_hub_link = None
-                hub_link = card.find('a', string=re.compile(r'Race Hub'))
-                if hub_link:
-                    race_hub_link = hub_link.get('href')
-                
-                event = {
-                    'title': name,
-                    'dates': dates,
-                    'venue': venue,
-                    'race_hub_url': race_hub_link,
-                    'source': 'competition_card'
-                }
-                
-                events.append(event)
-                
-            except Exception as e:
-                logger.debug(f"Error parsing competition card: {e}")
+        # Extract dates
+        dates_elem = card.find('div', class_='competition-card__dates')
+        dates = _element_text(dates_elem, NO_DATES)
+        
+        # Extract venue
+        venue_elem = card.find('div', class_='competition-card__venue')
+        venue = _element_text(venue_elem, NO_VENUE)
+        
+        # Extract race hub link
+        race_hub_link = None
+        hub_link = card.find('a', string=RACE_HUB_RE)
+        if hub_link is not None:
+            race_hub_link = hub_link.get('href')
         
-        return events
+        return RawEvent(
+            title=name,
+            dates=dates,
+            venue=venue,
+            race_hub_url=race_hub_link,
+            source='competition_card'
+        )
     
-    def parse_calendar_items(self, soup):
+    def parse_calendar_items(self, soup) -> List[RawEvent]:
         """Parse calendar-item elements from main list"""
-        events = []
-        calendar_items = soup.find_all('div', class_='calendar-item__title')
+        items = soup.find_all('div', class_=CALENDAR_ITEM_CLASS)
+        return [event for event in map(self.parse_calendar_item, items) if event]
+    
+    def parse_calendar_item(self, item) -> Optional[RawEvent]:
+        """Parse a single calendar-item__title element (None if it has no event link)"""
+        # Get the parent container
+        container = item.parent
         
-        for item in calendar_items:
-            try:
-                # Get the parent container
-                container = item.parent
-                
-                # Extract event name and URL
-                title_link = item.find('a')
-                if not title_link:
-                    continue
-                    
-                name = title_link.get_text(strip=True)
-                detail_url = title_link.get('href')
-                
-                # Find location and dates in sibling elements
-                location_elem = container.find('div', class_='calendar-item__location')
-                location = location_elem.get_text(strip=True) if location_elem else "No location"
-                
-                dates_elem = container.find('div', class_='calendar-item__dates')
-                dates = dates_elem.get_text(strip=True) if dates_elem else "No dates"
-                
-                # Parse location: "Venue | COUNTRY | REGION"
-                venue = "Unknown venue"
-                country = "Unknown country"
-                if location:
-                    parts = [p.strip() for p in location.split('|')]
-                    if len(parts) >= 2:
-                        venue = parts[0]
-                        country = parts[1]
-                
-                event = {
-                    'title': name,
-                    'dates': dates,
-                    'venue': venue,
-                    'country': country,
-                    'detail_url': detail_url,
-                    'source': 'calendar_item'
-                }
-                
-                events.append(event)
-                
-            except Exception as e:
-                logger.debug(f"Error parsing calendar item: {e}")
+        # Extract event name and URL
+        title_link = item.find('a')
+        if title_link is None:
+            return None
+        
+        name = _element_text(title_link, '')
+        detail_url = title_link.get('href')
+        
+        # Find location and dates in sibling elements
+        location_elem = container.find('div', class_='calendar-item__location')
+        location = _element_text(location_elem, NO_LOCATION)
         
-        return events
+        dates_elem = container.find('div', class_='calendar-item__dates')
+        dates = _element_text(dates_elem, NO_DATES)
+        
+        # Parse location: "Venue | COUNTRY | REGION"
+        # (only the first two fields are used, so partition instead of split)
+        venue, sep, rest = location.partition('|')
+        if sep:
+            venue = venue.strip()
+            country = rest.partition('|')[0].strip()
+        else:
+            venue = UNKNOWN_VENUE
+            country = UNKNOWN_COUNTRY
+        
+        return RawEvent(
+            title=name,
+            dates=dates,
+            venue=venue,
+            country=country,
+            detail_url=detail_url,
+            source='calendar_item'
+        )
     
     def parse_uci_dates(self, date_string):
         """Parse UCI date format into datetime objects"""
-        if not date_string or date_string == "No dates":
+        if not date_string or date_string == NO_DATES:
             return None, None
         
+        date_string = date_string.strip()
         try:
-            # Single date: "01 Jun 2025"
-            single_date_match = re.match(r'(\d{1,2}\s+\w+\s+\d{4})$', date_string.strip())
-            if single_date_match:
-                date_str = single_date_match.group(1)
-                parsed_date = datetime.strptime(date_str, '%d %b %Y')
+            # Single date "01 Jun 2025" - without a range dash, split it directly
+            # rather than running the regex
+            if '-' not in date_string:
+                parts = date_string.split()
+                if len(parts) != 3:
+                    return None, None
+                day, month, year = parts
+                if not (len(day) <= 2 and day.isdigit() and len(year) == 4 and year.isdigit()):
+                    return None, None
+                parsed_date = datetime(int(year), MONTHS[month.lower()], int(day))
                 return parsed_date, parsed_date
             
-            # Date range: "30 May - 01 Jun 2025"
-            range_match = re.match(r'(\d{1,2}\s+\w+)\s*-\s*(\d{1,2}\s+\w+\s+\d{4})', date_string.strip())
-            if range_match:
-                start_part = range_match.group(1)
-                end_part = range_match.group(2)
-                
-                # Extract year from end date and add to start if missing
-                year_match = re.search(r'\d{4}', end_part)
-                if year_match:
-                    year = year_match.group()
-                    if year not in start_part:
-                        start_part += f' {year}'
-                
-                start_date = datetime.strptime(start_part, '%d %b %Y')
-                end_date = datetime.strptime(end_part, '%d %b %Y')
-                return start_date, end_date
+            # Range "30 May - 01 Jun 2025"
+            match = UCI_DATES_RE.match(date_string)
+            if not match:
+                return None, None
             
-            return None, None
+            # The start of a range has no year - take it from the end date
+            start_date = _parse_day_month_year(f"{match.group('start')} {match.group('year')}")
+            end_date = _parse_day_month_year(match.group('end'))
+            return start_date, end_date
             
         except Exception as e:
             logger.debug(f"Date parsing error for '{date_string}': {e}")
             return None, None
     
-    def parse_events(self, html_content: str) -> List[Dict]:
-        """Parse events from the HTML content using multiple strategies"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        all_events = []
+    def parse_events(self, html_content: Union[str, bytes], min_year: Optional[int] = None) -> List[Dict]:
+        """
+        Parse events from the HTML content using multiple strategies
         
-        # Strategy 1: Parse competition cards (featured events in carousel)
-        competition_events = self.parse_competition_cards(soup)
-        all_events.extend(competition_events)
-        logger.info(f"Found {len(competition_events)} competition card events")
+        Args:
+            html_content: Calendar page HTML
+            min_year: Skip, before parsing their dates, events whose dates
+                mention no year from min_year on (they can only be earlier)
+        """
+        soup = BeautifulSoup(html_content, HTML_PARSER)
+        
+        # Both strategies in a single walk over the page:
+        # 1. competition cards (featured events in carousel)
+        # 2. calendar items (full calendar list)
+        competition_events = []
+        calendar_events = []
+        try:
+            for element in soup.find_all('div', class_=(COMPETITION_CARD_CLASS, CALENDAR_ITEM_CLASS)):
+                classes = element.get('class', ())
+                if COMPETITION_CARD_CLASS in classes:
+                    competition_events.append(self.parse_competition_card(element))
+                if CALENDAR_ITEM_CLASS in classes:
+                    calendar_events.append(self.parse_calendar_item(element))
+        except Exception as e:
+            # Keep whatever was parsed before the failure
+            logger.warning(f"Error parsing calendar page: {e}")
         
-        # Strategy 2: Parse calendar items (full calendar list)
-        calendar_events = self.parse_calendar_items(soup)
-        all_events.extend(calendar_events)
+        competition_events = [event for event in competition_events if event]
+        calendar_events = [event for event in calendar_events if event]
+        logger.info(f"Found {len(competition_events)} competition card events")
         logger.info(f"Found {len(calendar_events)} calendar item events")
         
+        # Featured competitions appear both as a card and in the calendar list -
+        # keep one event per (title, dates) pair, filling in whatever the first
+        # copy lacks (cards have no country or detail page link)
+        unique_events = {}
+        for event in competition_events + calendar_events:
+            key = (event.title, event.dates)
+            kept = unique_events.get(key)
+            if kept is None:
+                unique_events[key] = event
+            else:
+                unique_events[key] = replace(kept, **{
+                    field.name: getattr(event, field.name)
+                    for field in fields(kept) if getattr(kept, field.name) is None
+                })
+        all_events = list(unique_events.values())
+        
+        if min_year is not None:
+            all_events = [event for event in all_events
+                          if any(int(year) >= min_year for year in YEAR_RE.findall(event.dates))]
+        
+        # Parse every distinct dates string once up front - events on the same
+        # weekend share them
+        parsed_dates = {dates: self.parse_uci_dates(dates) for dates in {event.dates for event in all_events}}
+        
         # Convert to standard format
         standard_events = []
         for event in all_events:
-            try:
-                start_date, end_date = self.parse_uci_dates(event['dates'])
-                
-                if start_date:
-                    standard_event = {
-                        'title': event['title'],
-                        'date': start_date,
-                        'end_date': end_date if end_date != start_date else None,
-                        'location': event.get('venue', event.get('country', 'Unknown location')),
-                        'url': event.get('detail_url') or event.get('race_hub_url'),
-                        'country': event.get('country'),
-                        'category': event.get('category', 'Mountain Bike')
-                    }
-                    standard_events.append(standard_event)
-                    
-            except Exception as e:
-                logger.debug(f"Error converting event: {e}")
+            start_date, end_date = parsed_dates[event.dates]
+            
+            if start_date:
+                standard_event = {
+                    'title': event.title,
+                    'date': start_date,
+                    'end_date': end_date if end_date != start_date else None,
+                    'location': event.venue,
+                    'url': event.detail_url or event.race_hub_url,
+                    'country': event.country,
+                    'category': EVENT_CATEGORY
+                }
+                standard_events.append(standard_event)
         
         logger.info(f"Converted {len(standard_events)} events with valid dates")
         return standard_events
@@ -208,15 +362,15 @@ class UCICalendarScraper:
         """Extract event data from a DOM element"""
         try:
             # Look for date patterns
-            date_text = self.find_text_with_pattern(element, r'\d{1,2}[/-]\d{1,2}[/-]\d{4}|\d{4}-\d{2}-\d{2}')
+            date_text = self.find_text_with_pattern(element, DATE_IN_TEXT_RE)
             
             # Look for event titles/names
-            title_elem = element.find(['h1', 'h2', 'h3', 'h4', 'a', 'span'], class_=re.compile(r'title|name|event', re.I))
+            title_elem = element.find(['h1', 'h2', 'h3', 'h4', 'a', 'span'], class_=TITLE_CLASS_RE)
             title = title_elem.get_text(strip=True) if title_elem else None
             
             # Look for location
-            location_elem = element.find(text=re.compile(r'location|venue|city|country', re.I))
-            location = location_elem.strip() if location_elem else None
+            location_elem = element.find(string=LOCATION_TEXT_RE)
+            location = location_elem.strip() if location_elem is not None else None
             
             if date_text and title:
                 return {
@@ -230,10 +384,12 @@ class UCICalendarScraper:
         
         return None
     
-    def find_text_with_pattern(self, element, pattern: str) -> Optional[str]:
-        """Find text matching a regex pattern within an element"""
+    def find_text_with_pattern(self, element, pattern: Union[str, re.Pattern]) -> Optional[str]:
+        """Find text matching a regex pattern (string or precompiled) within an element"""
+        if isinstance(pattern, str):
+            pattern = re.compile(pattern)
         text = element.get_text()
-        match = re.search(pattern, text)
+        match = pattern.search(text)
         return match.group(0) if match else None
     
     def parse_date(self, date_text: str) -> Optional[datetime]:
@@ -273,15 +429,14 @@ class UCICalendarScraper:
         if not html_content:
             return []
         
-        events = self.parse_events(html_content)
-        
-        # Filter out events without dates or in the past
-        valid_events = []
+        # Filter out events without dates or in the past (events from earlier
+        # years are dropped before their dates are even parsed)
         cutoff_date = datetime.now() - timedelta(days=1)
+        events = self.parse_events(html_content, min_year=cutoff_date.year)
         
-        for event in events:
-            if event.get('date') and event['date'] > cutoff_date:
-                valid_events.append(event)
+        # parse_events only returns events with a start date, so a plain
+        # comparison against the precomputed cutoff is enough
+        valid_events = [event for event in events if event['date'] > cutoff_date]
         
         logger.info(f"Returning {len(valid_events)} valid upcoming events")
         return valid_events